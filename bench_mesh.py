@@ -0,0 +1,96 @@
+"""
+Skalierungs-Benchmark für das Meshen im Thread-Pool (ohne GLFW/OpenGL).
+
+Generiert und beleuchtet die Chunks in einem Radius, baut die gepaddeten
+Eingaben vorab und misst dann den Mesh-Durchsatz (Chunks/s) mit 1, 2, 4, ...
+Threads. Die Numba-Kernel laufen ohne GIL, der Durchsatz sollte also bis zur
+Anzahl der Kerne mitwachsen.
+
+Beispiel:
+    python bench_mesh.py --radius 6 --max-workers 8
+"""
+import os
+import sys
+import time
+import argparse
+import concurrent.futures
+
+from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, WorldSeed, generate_region
+from src.chunk_mesh import mesh_worker_wrapper
+from src.block_definitions import BLOCKS
+from src.chunk_neighborhood import gather_padded, section_mesh_mask
+from src.lighting_system import LightingSystem
+
+
+def _worker_counts(max_workers):
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def _prepare_jobs(radius, seed_value):
+    """Blockdaten, Licht und gepaddete Mesh-Eingaben für alle Chunks im Radius."""
+    side = 2 * radius + 1
+    world_data = generate_region(-radius, -radius, side, side, WorldSeed(seed_value))
+    lighting = LightingSystem(CHUNK_SIZE, MAX_HEIGHT)
+    for coord, block_data in world_data.items():
+        lighting.init_chunk_lighting(coord, block_data)
+
+    return [(cx, cz, gather_padded(world_data, (cx, cz)), gather_padded(lighting.light_data, (cx, cz)),
+             section_mesh_mask(world_data, (cx, cz), BLOCKS.opaque))
+            for (cx, cz) in world_data]
+
+
+def _run(jobs, workers, rounds):
+    """Meshed alle Jobs rounds-mal mit workers Threads, Rückgabe: Chunks/s."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        # Aufwärmen: Scratch-Puffer pro Thread anlegen
+        for res in pool.map(lambda job: mesh_worker_wrapper(*job), jobs[:workers]):
+            if isinstance(res, Exception):
+                raise res
+
+        t = time.perf_counter()
+        for _ in range(rounds):
+            for res in pool.map(lambda job: mesh_worker_wrapper(*job), jobs):
+                if isinstance(res, Exception):
+                    raise res
+        elapsed = time.perf_counter() - t
+    return len(jobs) * rounds / elapsed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mesh-Durchsatz gegen Anzahl Threads messen.")
+    parser.add_argument("--radius", type=int, default=6, help="Radius in Chunks um (0, 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Welt-Seed")
+    parser.add_argument("--rounds", type=int, default=3, help="Durchläufe pro Thread-Anzahl")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="Größte getestete Thread-Anzahl")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    t = time.perf_counter()
+    jobs = _prepare_jobs(args.radius, args.seed)
+    print(f"🧱 {len(jobs)} Chunks vorbereitet in {time.perf_counter() - t:.2f}s "
+          f"({os.cpu_count()} Kerne verfügbar)")
+
+    # Numba-Kernel einmal kompilieren/laden, bevor gemessen wird
+    mesh_worker_wrapper(*jobs[0])
+
+    baseline = None
+    print(f"   {'Threads':>7} {'Chunks/s':>10} {'Speedup':>8} {'Effizienz':>10}")
+    for workers in _worker_counts(max(args.max_workers, 1)):
+        throughput = _run(jobs, workers, args.rounds)
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+        print(f"   {workers:>7} {throughput:>10.1f} {speedup:>7.2f}x {speedup / workers:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Headless Welt-Vorgenerierung (ohne GLFW/OpenGL).
+
+Generiert und beleuchtet alle Chunks in einem Radius um ein Zentrum auf allen
+Kernen und speichert Blockdaten und Lichtkarten im Welt-Ordner, den der
+ChunkManager beim Spielstart liest. Mit --mesh werden die Chunks zusätzlich in
+den Mesh-Cache der Welt gemesht (derselbe, aus dem das Spiel liest).
+
+Beispiel:
+    python pregen.py --radius 16 --mesh
+"""
+import os
+import sys
+import time
+import argparse
+import concurrent.futures
+
+from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, RENDER_DISTANCE_CHUNKS, COLUMN_CACHE, WorldSeed, generate_region
+from src.chunk_mesh import mesh_snapshot_worker
+from src.chunk_neighborhood import neighbor_coords
+from src.chunk_sections import SectionedChunk
+from src.lighting_system import LightingSystem
+from src.mesh_cache import MeshCache, MESH_CACHE_DIR, MESH_CACHE_MAX_BYTES
+from src.world_storage import WorldStorage
+
+DEFAULT_WORLD_DIR = os.path.join("worlds", "default")
+PREGEN_BATCH_SIZE = 8
+
+
+def _generate_batch(cx0, cz0, w, h, seed_value):
+    """Worker: generiert eine Region; dazu PID und Spalten-Cache-Statistik des Worker-Prozesses."""
+    t0 = time.perf_counter()
+    chunks = generate_region(cx0, cz0, w, h, WorldSeed(seed_value))
+    return chunks, time.perf_counter() - t0, os.getpid(), COLUMN_CACHE.stats()
+
+
+def _column_cache_summary(worker_stats):
+    """Summiert die (kumulativen) Spalten-Cache-Statistiken der Worker-Prozesse."""
+    hits = sum(stats["hits"] for stats in worker_stats.values())
+    misses = sum(stats["misses"] for stats in worker_stats.values())
+    tiles = sum(stats["tiles"] for stats in worker_stats.values())
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0, "tiles": tiles}
+
+
+def _mesh_chunk(cx, cz, blocks, lights, cache):
+    """Worker (Thread): mesht einen Chunk in den Mesh-Cache, wie ChunkManager._submit_mesh."""
+    t0 = time.perf_counter()
+    res = mesh_snapshot_worker(cx, cz, blocks, lights, None, cache)
+    return res, time.perf_counter() - t0
+
+
+def _peak_rss_mb():
+    """(Hauptprozess, größter beendeter Worker) in MB, oder None wenn nicht messbar."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2 ** 20, None
+        except (ImportError, AttributeError):
+            return None, None
+
+    # ru_maxrss ist auf Linux in KB, auf macOS in Bytes
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20
+    return own, children
+
+
+def _region_batches(center_x, center_z, radius):
+    S = PREGEN_BATCH_SIZE
+    x_min, x_max = center_x - radius, center_x + radius + 1
+    z_min, z_max = center_z - radius, center_z + radius + 1
+    for bx0 in range(x_min, x_max, S):
+        for bz0 in range(z_min, z_max, S):
+            yield bx0, bz0, min(S, x_max - bx0), min(S, z_max - bz0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Welt ohne Fenster vorgenerieren.")
+    parser.add_argument("--radius", type=int, default=RENDER_DISTANCE_CHUNKS,
+                        help="Radius in Chunks (Quadrat wie beim Laden im Spiel)")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("CX", "CZ"),
+                        help="Zentrum in Chunk-Koordinaten")
+    parser.add_argument("--seed", type=int, default=0, help="Welt-Seed")
+    parser.add_argument("--world", default=DEFAULT_WORLD_DIR, help="Zielordner der Welt")
+    parser.add_argument("--mesh", action="store_true", help="Chunks zusätzlich in den Mesh-Cache der Welt meshen")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Anzahl Worker-Prozesse")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    world_seed = WorldSeed(args.seed)
+    storage = WorldStorage(args.world, world_seed)
+    if not storage.enabled and not storage.outdated:
+        return 1
+    storage.write_meta()
+
+    side = 2 * args.radius + 1
+    total_chunks = side * side
+    print(f"⛏️ Pregen: {total_chunks} Chunks (Radius {args.radius} um {tuple(args.center)}), "
+          f"Seed {world_seed.value}, {args.workers} Worker -> {args.world}")
+
+    wall = {}
+    worker_time = {"generate": 0.0, "light": 0.0, "mesh": 0.0}
+    world_data = {}
+    column_stats = {}  # {Worker-PID: letzte COLUMN_CACHE.stats()}
+    lighting = LightingSystem(CHUNK_SIZE, MAX_HEIGHT)
+    start = time.perf_counter()
+
+    # 1. Generieren (parallel pro Region)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+        t = time.perf_counter()
+        jobs = [pool.submit(_generate_batch, *batch, world_seed.value)
+                for batch in _region_batches(args.center[0], args.center[1], args.radius)]
+        for job in concurrent.futures.as_completed(jobs):
+            chunks, t_gen, pid, stats = job.result()
+            worker_time["generate"] += t_gen
+            # Zähler wachsen pro Prozess nur, Jobs kommen aber in beliebiger Reihenfolge zurück
+            last = column_stats.get(pid)
+            if last is None or stats["hits"] + stats["misses"] >= last["hits"] + last["misses"]:
+                column_stats[pid] = stats
+            world_data.update(chunks)
+        wall["generate"] = time.perf_counter() - t
+
+    # 2. Licht (wie ChunkManager beim Laden; alle Chunks der Region, damit der Rand
+    #    beim Meshen aus echten Nachbar-Lichtkarten kommt)
+    t = time.perf_counter()
+    for coord, block_data in world_data.items():
+        lighting.init_chunk_lighting(coord, block_data)
+    wall["light"] = worker_time["light"] = time.perf_counter() - t
+
+    # 3. Optional: Meshes in den Mesh-Cache. Nur Chunks, deren 8 Nachbarn generiert
+    #    wurden: nur dann stimmt der Cache-Schlüssel mit dem im Spiel überein.
+    #    Threads reichen, die Mesher geben den GIL frei.
+    meshed = 0
+    cache = None
+    if args.mesh and MESH_CACHE_MAX_BYTES > 0:
+        t = time.perf_counter()
+        cache = MeshCache(os.path.join(args.world, MESH_CACHE_DIR), MESH_CACHE_MAX_BYTES)
+        blocks = {coord: SectionedChunk.from_dense(block_data) for coord, block_data in world_data.items()}
+        inner = [coord for coord in world_data if all(n in world_data for n in neighbor_coords(coord))]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as mesh_pool:
+            jobs = {mesh_pool.submit(_mesh_chunk, cx, cz, blocks, lighting.light_data, cache): (cx, cz)
+                    for (cx, cz) in inner}
+            for job in concurrent.futures.as_completed(jobs):
+                res, t_mesh = job.result()
+                worker_time["mesh"] += t_mesh
+                if isinstance(res, Exception):
+                    print(f"Mesh Error {jobs[job]}: {res}")
+                    continue
+                meshed += 1
+        wall["mesh"] = time.perf_counter() - t
+
+    # 4. Speichern (zlib gibt den GIL frei -> Threads reichen)
+    t = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as io_pool:
+        saves = [io_pool.submit(storage.save_chunk, cx, cz, block_data, lighting.light_data[(cx, cz)])
+                 for (cx, cz), block_data in world_data.items()]
+        for job in saves:
+            job.result()
+    wall["save"] = time.perf_counter() - t
+
+    elapsed = time.perf_counter() - start
+
+    # --- Report ---
+    print(f"✅ {len(world_data)} Chunks in {elapsed:.2f}s -> {len(world_data) / max(elapsed, 1e-9):.1f} Chunks/s")
+    column = _column_cache_summary(column_stats)
+    print(f"   Spalten-Cache (Worker): {column['hits']} Treffer, {column['misses']} Fehlschläge "
+          f"({column['hit_rate']:.0%}), {column['tiles']} Kacheln")
+    print("   Stufen (Wandzeit):")
+    for stage, seconds in wall.items():
+        print(f"     {stage:<15} {seconds:8.2f}s")
+    print("   Stufen (Worker-CPU, Summe):")
+    for stage, seconds in worker_time.items():
+        if seconds > 0:
+            per_chunk = seconds / max(len(world_data), 1) * 1000
+            print(f"     {stage:<15} {seconds:8.2f}s  ({per_chunk:.2f} ms/Chunk)")
+    if cache is not None:
+        print(f"   Mesh-Cache: {meshed} Chunks gemesht, {len(cache)} Einträge, "
+              f"{cache.total_bytes / 2 ** 20:.1f} MB, Trefferquote {cache.hit_rate:.0%}")
+
+    own_rss, child_rss = _peak_rss_mb()
+    if own_rss is None:
+        print("   Peak RSS: nicht verfügbar")
+    else:
+        child_info = f", größter Worker {child_rss:.1f} MB" if child_rss else ""
+        print(f"   Peak RSS: Hauptprozess {own_rss:.1f} MB{child_info}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,19 @@
 import numpy as np
 
 # --- Block-IDs ---
-ID_AIR = -1.0
-ID_GRASS = 0.0
-ID_DIRT = 1.0
-ID_STONE = 2.0
-ID_OAK_LOG = 3.0
-ID_LEAVES = 4.0
-ID_SAND = 5.0
-ID_CACTUS = 6.0
-ID_WATER = 7.0  # <--- ID 7
+# Kompakte Integer-IDs (1 Byte pro Voxel), Luft ist 0.
+# Für mehr als 256 Blocktypen reicht es, BLOCK_DTYPE auf np.uint16 zu stellen.
+BLOCK_DTYPE = np.uint8
+
+ID_AIR = 0
+ID_GRASS = 1
+ID_DIRT = 2
+ID_STONE = 3
+ID_OAK_LOG = 4
+ID_LEAVES = 5
+ID_SAND = 6
+ID_CACTUS = 7
+ID_WATER = 8
 
 # --- Textur-Indizes (MÜSSEN LÜCKENLOS SEIN!) ---
 TEX_INDEX_GRASS_TOP = 0.0
@@ -26,35 +30,6 @@ TEX_INDEX_CACTUS_TOP = 9.0
 TEX_INDEX_HOTBAR = 10.0
 TEX_INDEX_WATER = 11.0  # <--- Das ist die 12. Textur (Zählung beginnt bei 0)
 
-# --- Numba Arrays ---
-# ID_WATER muss hier drin sein, damit man durchlaufen kann
-NON_SOLID_BLOCKS_NUMBA = np.array([ID_AIR, ID_LEAVES, ID_WATER], dtype=np.float32)
-
-OAK_LOG_TEXTURES = np.array([
-    TEX_INDEX_LOG_TOP, TEX_INDEX_LOG_TOP,
-    TEX_INDEX_LOG_SIDE, TEX_INDEX_LOG_SIDE,
-    TEX_INDEX_LOG_SIDE, TEX_INDEX_LOG_SIDE
-], dtype=np.float32)
-
-GRASS_TEXTURES = np.array([
-    TEX_INDEX_GRASS_TOP, TEX_INDEX_DIRT,
-    TEX_INDEX_GRASS_SIDE, TEX_INDEX_GRASS_SIDE,
-    TEX_INDEX_GRASS_SIDE, TEX_INDEX_GRASS_SIDE
-], dtype=np.float32)
-
-CACTUS_TEXTURES = np.array([
-    TEX_INDEX_CACTUS_TOP, TEX_INDEX_CACTUS_TOP,
-    TEX_INDEX_CACTUS_SIDE, TEX_INDEX_CACTUS_SIDE,
-    TEX_INDEX_CACTUS_SIDE, TEX_INDEX_CACTUS_SIDE
-], dtype=np.float32)
-
-# Wasser Texturen
-WATER_TEXTURES = np.array([
-    TEX_INDEX_WATER, TEX_INDEX_WATER,
-    TEX_INDEX_WATER, TEX_INDEX_WATER,
-    TEX_INDEX_WATER, TEX_INDEX_WATER
-], dtype=np.float32)
-
 # --- Texture Config ---
 # WICHTIG: Prüfe, ob "assets/water.png" wirklich existiert!
 TEXTURE_CONFIG = {
@@ -72,20 +47,126 @@ TEXTURE_CONFIG = {
     TEX_INDEX_WATER: "assets/water.png",  # <--- Datei muss da sein
 }
 
-BLOCK_HARDNESS = {
-    ID_GRASS: 0.6,
-    ID_DIRT: 0.5,
-    ID_STONE: 1.5,
-    ID_OAK_LOG: 2.0,
-    ID_LEAVES: 0.2,
-    ID_SAND: 0.5,
-    ID_CACTUS: 0.4,
-    ID_WATER: 0.0,
-    ID_AIR: 0.0
-}
-
 DEFAULT_HARDNESS = 1.0
 
+# Lichtdämpfung: 0 = durchsichtig, MAX_LIGHT_ATTENUATION = blockt Licht komplett
+MAX_LIGHT_ATTENUATION = 15
+
+
+class BlockRegistry:
+    """
+    Zentrale Sammlung aller Block-Eigenschaften.
+
+    Blöcke werden einmal mit register() beschrieben, compile() erzeugt daraus
+    dichte NumPy-Tabellen, die direkt mit der Block-ID indiziert werden
+    (auch in Numba-Kerneln, dort als Argument übergeben):
+
+        face_textures[id, face]     Textur-Index pro Seite (Reihenfolge wie CUBE_NORMALS)
+        opaque[id]                  Verdeckt Nachbarflächen vollständig
+        light_attenuation[id]       Lichtverlust beim Durchqueren (0..15)
+        solid[id]                   Kollision für Spieler und Items
+        hardness[id]                Abbauzeit in Sekunden (0 = sofort)
+        face_visible[id, nachbar]   Wird die Fläche zwischen beiden Blöcken gezeichnet?
+
+    Ein neuer Block braucht nur einen register()-Aufruf hier.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+
+    def register(self, block_id, name, textures=None, opaque=True, fluid=False, solid=True,
+                 light_attenuation=MAX_LIGHT_ATTENUATION, hardness=DEFAULT_HARDNESS):
+        """
+        textures: ein Textur-Index für alle Seiten oder 6 Indizes (Top, Bottom, Left, Right, Front, Back).
+        fluid: Flächen zu gleichartigen Nachbarn entfallen, alle anderen werden gezeichnet.
+        """
+        if block_id in self._blocks:
+            raise ValueError(f"Block-ID {block_id} ist bereits als '{self._blocks[block_id]['name']}' registriert")
+        if textures is None:
+            textures = (-1.0,) * 6
+        elif np.isscalar(textures):
+            textures = (textures,) * 6
+        if len(textures) != 6:
+            raise ValueError(f"Block '{name}': 6 Textur-Indizes erwartet, {len(textures)} erhalten")
+
+        self._blocks[block_id] = {
+            'name': name, 'textures': tuple(float(t) for t in textures),
+            'opaque': opaque, 'fluid': fluid, 'solid': solid,
+            'light_attenuation': light_attenuation, 'hardness': hardness,
+        }
+
+    def name(self, block_id):
+        block = self._blocks.get(int(block_id))
+        return block['name'] if block else f"unbekannt ({block_id})"
+
+    def __contains__(self, block_id):
+        return int(block_id) in self._blocks
+
+    def compile(self):
+        # Tabellen decken den ganzen Wertebereich von BLOCK_DTYPE ab, damit auch
+        # unbekannte IDs gefahrlos nachgeschlagen werden können
+        count = int(np.iinfo(BLOCK_DTYPE).max) + 1
+
+        self.face_textures = np.full((count, 6), -1.0, dtype=np.float32)
+        self.opaque = np.zeros(count, dtype=np.bool_)
+        self.fluid = np.zeros(count, dtype=np.bool_)
+        self.solid = np.zeros(count, dtype=np.bool_)
+        self.light_attenuation = np.full(count, MAX_LIGHT_ATTENUATION, dtype=np.uint8)
+        self.hardness = np.full(count, DEFAULT_HARDNESS, dtype=np.float32)
+
+        for block_id, block in self._blocks.items():
+            self.face_textures[block_id] = block['textures']
+            self.opaque[block_id] = block['opaque']
+            self.fluid[block_id] = block['fluid']
+            self.solid[block_id] = block['solid']
+            self.light_attenuation[block_id] = block['light_attenuation']
+            self.hardness[block_id] = block['hardness']
+
+        # Sichtbarkeit einer Fläche von "block" zum Nachbarn "neighbor":
+        #   undurchsichtig: sichtbar, wenn der Nachbar nicht undurchsichtig ist
+        #   Flüssigkeit:    sichtbar, wenn der Nachbar eine andere ID hat
+        #   sonst (Blätter): sichtbar zu nicht-undurchsichtigen Nachbarn außer Flüssigkeiten
+        see_through = ~self.opaque
+        visible = np.empty((count, count), dtype=np.bool_)
+        visible[:] = see_through[None, :] & ~self.fluid[None, :]
+        visible[self.opaque] = see_through[None, :]
+        for block_id in np.flatnonzero(self.fluid):
+            visible[block_id] = True
+            visible[block_id, block_id] = False
+        visible[ID_AIR] = False  # Luft wird nie gemesht
+        self.face_visible = visible
+        return self
+
+
+BLOCKS = BlockRegistry()
+BLOCKS.register(ID_AIR, "Luft", opaque=False, solid=False, light_attenuation=0, hardness=0.0)
+BLOCKS.register(ID_GRASS, "Gras",
+                (TEX_INDEX_GRASS_TOP, TEX_INDEX_DIRT,
+                 TEX_INDEX_GRASS_SIDE, TEX_INDEX_GRASS_SIDE, TEX_INDEX_GRASS_SIDE, TEX_INDEX_GRASS_SIDE),
+                hardness=0.6)
+BLOCKS.register(ID_DIRT, "Erde", TEX_INDEX_DIRT, hardness=0.5)
+BLOCKS.register(ID_STONE, "Stein", TEX_INDEX_STONE, hardness=1.5)
+BLOCKS.register(ID_OAK_LOG, "Eichenstamm",
+                (TEX_INDEX_LOG_TOP, TEX_INDEX_LOG_TOP,
+                 TEX_INDEX_LOG_SIDE, TEX_INDEX_LOG_SIDE, TEX_INDEX_LOG_SIDE, TEX_INDEX_LOG_SIDE),
+                hardness=2.0)
+BLOCKS.register(ID_LEAVES, "Blätter", TEX_INDEX_LEAVES, opaque=False, light_attenuation=1, hardness=0.2)
+BLOCKS.register(ID_SAND, "Sand", TEX_INDEX_SAND, hardness=0.5)
+BLOCKS.register(ID_CACTUS, "Kaktus",
+                (TEX_INDEX_CACTUS_TOP, TEX_INDEX_CACTUS_TOP,
+                 TEX_INDEX_CACTUS_SIDE, TEX_INDEX_CACTUS_SIDE, TEX_INDEX_CACTUS_SIDE, TEX_INDEX_CACTUS_SIDE),
+                hardness=0.4)
+BLOCKS.register(ID_WATER, "Wasser", TEX_INDEX_WATER, opaque=False, fluid=True, solid=False, hardness=0.0)
+BLOCKS.compile()
+
+# Kurzformen für Hot-Paths (Numba-Kernel bekommen sie als Argument)
+BLOCK_FACE_TEXTURES = BLOCKS.face_textures
+BLOCK_FACE_VISIBLE = BLOCKS.face_visible
+BLOCK_LIGHT_ATTENUATION = BLOCKS.light_attenuation
+BLOCK_SOLID = BLOCKS.solid
+BLOCK_HARDNESS = BLOCKS.hardness
+
+
 def get_texture_paths():
     sorted_keys = sorted(TEXTURE_CONFIG.keys())
     return [TEXTURE_CONFIG[key] for key in sorted_keys]
\ No newline at end of file
@@ -1,23 +1,28 @@
 # --- src/chunk_data.py ---
 import numpy as np
-from noise import pnoise2
-import random
 
 # Importiere alle nötigen IDs (inklusive ID_WATER)
 from .block_definitions import (
     ID_AIR, ID_GRASS, ID_DIRT, ID_STONE,
-    ID_OAK_LOG, ID_LEAVES, ID_SAND, ID_CACTUS, ID_WATER
+    ID_OAK_LOG, ID_LEAVES, ID_SAND, ID_CACTUS, ID_WATER, BLOCK_DTYPE
 )
+from .terrain_noise import noise_tile
+from .column_cache import ColumnTileCache
 
 # --- Globale Config ---
 CHUNK_SIZE = 16
+# Welthöhe, Vielfaches von 16 (z.B. 256 oder 384 für Berge). Wird in world.json
+# gespeichert; Mesher, Licht und Kollision lesen die Höhe aus den Arrays und
+# überspringen leere bzw. volle 16er-Sections, höhere Welten kosten also kaum mehr.
 MAX_HEIGHT = 64
 RENDER_DISTANCE_CHUNKS = 11 # 8
 
 # Meeresspiegel (Alles darunter wird mit Wasser gefüllt)
 SEA_LEVEL = 26
 
-BLOCK_DATA_SHAPE = (CHUNK_SIZE + 2, MAX_HEIGHT, CHUNK_SIZE + 2)
+# Chunks werden ohne Rand gespeichert; Mesher/Licht bekommen die Nachbarn
+# erst beim Aufruf dazu (siehe chunk_neighborhood.py)
+BLOCK_DATA_SHAPE = (CHUNK_SIZE, MAX_HEIGHT, CHUNK_SIZE)
 
 # --- NOISE-SETTINGS ---
 BASE_SCALE = 0.005
@@ -33,6 +38,51 @@ BIOME_SCALE = 0.003
 # Alles über 0.1 wird Wüste
 BIOME_THRESHOLD = 0.1
 
+# --- CACHE SETTINGS ---
+# ~1.3 KB pro Kachel, reicht für mehrere Sichtweiten hin und her
+COLUMN_CACHE_MAX_TILES = 4096
+
+# --- SEED SETTINGS ---
+# Seed 0 erzeugt exakt die bisherige Welt
+DEFAULT_WORLD_SEED = 0
+# Maximale Noise-Verschiebung (in Chunks), damit float32-Noise genau bleibt
+SEED_OFFSET_RANGE_CHUNKS = 4096
+
+
+class WorldSeed:
+    """
+    Welt-Seed für deterministische Generierung.
+
+    Andere Seeds verschieben den Noise-Raum um ganze Chunks (dadurch bleiben die
+    Spalten-Kacheln im Cache gültig) und liefern pro Chunk einen eigenen
+    Zufallsstrom, abgeleitet aus (seed, cx, cz). Gleicher Seed + gleiche
+    Koordinate = bitgleicher Chunk, unabhängig von Thread oder Reihenfolge.
+    """
+
+    def __init__(self, value=DEFAULT_WORLD_SEED):
+        self.value = int(value) & 0xFFFFFFFFFFFFFFFF
+
+        if self.value == DEFAULT_WORLD_SEED:
+            self.chunk_offset = (0, 0)
+        else:
+            offset_rng = np.random.default_rng(self._entropy())
+            ox, oz = offset_rng.integers(-SEED_OFFSET_RANGE_CHUNKS, SEED_OFFSET_RANGE_CHUNKS + 1, size=2)
+            self.chunk_offset = (int(ox), int(oz))
+
+    def _entropy(self, *extra):
+        return [self.value & 0xFFFFFFFF, self.value >> 32, *[v & 0xFFFFFFFF for v in extra]]
+
+    def noise_chunk(self, cx, cz):
+        """Chunk-Koordinate im (verschobenen) Noise-Raum."""
+        return cx + self.chunk_offset[0], cz + self.chunk_offset[1]
+
+    def chunk_rng(self, cx, cz):
+        """Eigener Zufallsgenerator pro Chunk, kein geteilter globaler Zustand."""
+        return np.random.default_rng(np.random.SeedSequence(self._entropy(cx, cz)))
+
+    def __repr__(self):
+        return f"WorldSeed({self.value})"
+
 
 def place_tree(block_data, x, z, y_surface):
     """Platziert einen einfachen Eichenbaum."""
@@ -54,7 +104,7 @@ def place_tree(block_data, x, z, y_surface):
 
         for cx in range(x - current_radius, x + current_radius + 1):
             for cz in range(z - current_radius, z + current_radius + 1):
-                if 0 < cx < CHUNK_SIZE + 1 and 0 < cz < CHUNK_SIZE + 1:
+                if 0 <= cx < CHUNK_SIZE and 0 <= cz < CHUNK_SIZE:
                     # Nicht den Stamm überschreiben
                     if not (cx == x and cz == z):
                         # Nur in Luft platzieren (nicht Wasser oder Stein überschreiben)
@@ -62,9 +112,9 @@ def place_tree(block_data, x, z, y_surface):
                             block_data[cx, cy, cz] = ID_LEAVES
 
 
-def place_cactus(block_data, x, z, y_surface):
+def place_cactus(block_data, x, z, y_surface, rng):
     """Platziert einen Kaktus (Höhe 1 bis 3)."""
-    height = random.randint(1, 3)
+    height = int(rng.integers(1, 4))
     for i in range(height):
         y = y_surface + 1 + i
         if y < MAX_HEIGHT:
@@ -73,111 +123,197 @@ def place_cactus(block_data, x, z, y_surface):
                 block_data[x, y, z] = ID_CACTUS
 
 
-def generate_chunk_block_data(cx, cz):
-    block_data = np.full(BLOCK_DATA_SHAPE, ID_AIR, dtype=np.float32)
-
-    base_x = cx * CHUNK_SIZE - 1
-    base_z = cz * CHUNK_SIZE - 1
-    heightmap = {}
-    biome_map = {}
-
-    # 1. Terrain & Biome Map Generierung
-    for x in range(CHUNK_SIZE + 2):
-        for z in range(CHUNK_SIZE + 2):
-            wx = base_x + x
-            wz = base_z + z
-
-            # --- BIOME NOISE ---
-            biome_val = pnoise2(wx * BIOME_SCALE, wz * BIOME_SCALE, octaves=2, base=777)
-            is_desert = biome_val > BIOME_THRESHOLD
-            biome_map[(x, z)] = is_desert
-
-            # --- HÖHEN NOISE ---
-            base_noise_raw = pnoise2(wx * BASE_SCALE, wz * BASE_SCALE,
-                                     octaves=MAIN_OCTAVES, repeatx=1024, repeaty=1024, base=111)
-            detail_noise_raw = pnoise2(wx * DETAIL_SCALE, wz * DETAIL_SCALE,
-                                       octaves=1, repeatx=1024, repeaty=1024, base=222)
-
-            combined_noise = base_noise_raw * 0.7 + detail_noise_raw * 0.3
-            normalized_noise = (combined_noise + 1.0) * 0.5
-            exp_noise = normalized_noise ** EXPONENT
-            final_height = exp_noise * MAIN_AMPLITUDE + FLAT_BASE_HEIGHT
-
-            height = int(max(1.0, min(final_height, MAX_HEIGHT - 3))) + 3
-            heightmap[(x, z)] = height
-
-            # --- BLOCK FILLING ---
-            for y in range(MAX_HEIGHT):
-                # A) LANDSCHAFT (Solide Blöcke)
-                if y < height:
-                    if is_desert:
-                        # Wüste: Sand oben, Sandstein/Stein darunter
-                        if y >= height - 3:
-                            block_data[x, y, z] = ID_SAND
-                        else:
-                            block_data[x, y, z] = ID_STONE
-                    else:
-                        # STRAND-CHECK: Ist die Oberfläche nah am Wasser?
-                        # Wenn ja -> Sand statt Gras/Erde
-                        is_beach = (height <= SEA_LEVEL + 2)
-
-                        if is_beach:
-                            if y >= height - 2:
-                                block_data[x, y, z] = ID_SAND
-                            else:
-                                block_data[x, y, z] = ID_STONE
-                        else:
-                            # Normales Grasland/Gebirge
-                            if y == height - 1:
-                                block_data[x, y, z] = ID_GRASS
-                            elif y >= height - 4:
-                                block_data[x, y, z] = ID_DIRT
-                            else:
-                                block_data[x, y, z] = ID_STONE
-
-                # B) WASSER (Füllt Luft unter dem Meeresspiegel auf)
-                elif y <= SEA_LEVEL:
-                    # Wenn hier noch nichts ist (Luft), dann mach Wasser rein
-                    if block_data[x, y, z] == ID_AIR:
-                        block_data[x, y, z] = ID_WATER
-
-    # 2. Vegetation (Bäume und Kakteen)
+def compute_column_maps(base_x, base_z, size_x=CHUNK_SIZE, size_z=None, step=1):
+    """
+    Berechnet Heightmap und Biom-Maske für size_x x size_z Spalten ab (base_x, base_z).
+    Gibt (heightmap[int32], desert_mask[bool]) zurück. Standard: eine 16x16 Chunk-Kachel.
+    step > 1 tastet nur jede step-te Spalte ab (Horizont, siehe horizon.py).
+    """
+    if size_z is None:
+        size_z = size_x
+    xs = base_x + np.arange(size_x, dtype=np.float64) * step
+    zs = base_z + np.arange(size_z, dtype=np.float64) * step
+
+    # --- BIOME NOISE ---
+    biome_val = noise_tile(xs, zs, BIOME_SCALE, octaves=2, base=777)
+    desert_mask = biome_val > BIOME_THRESHOLD
+
+    # --- HÖHEN NOISE ---
+    base_noise_raw = noise_tile(xs, zs, BASE_SCALE, octaves=MAIN_OCTAVES, base=111).astype(np.float64)
+    detail_noise_raw = noise_tile(xs, zs, DETAIL_SCALE, octaves=1, base=222).astype(np.float64)
+
+    combined_noise = base_noise_raw * 0.7 + detail_noise_raw * 0.3
+    normalized_noise = (combined_noise + 1.0) * 0.5
+    exp_noise = normalized_noise ** EXPONENT
+    final_height = exp_noise * MAIN_AMPLITUDE + FLAT_BASE_HEIGHT
+
+    heightmap = np.clip(final_height, 1.0, MAX_HEIGHT - 3).astype(np.int32) + 3
+
+    return heightmap, desert_mask
+
+
+def compute_vegetation_maps(base_x, base_z, size_x=CHUNK_SIZE, size_z=None):
+    """Zufalls-Karten (0..1) für Kakteen und Bäume, gleiche Kachelung wie compute_column_maps."""
+    if size_z is None:
+        size_z = size_x
+    xs = np.arange(base_x, base_x + size_x, dtype=np.float64)
+    zs = np.arange(base_z, base_z + size_z, dtype=np.float64)
+    cactus_chance = (noise_tile(xs, zs, 0.5, base=888).astype(np.float64) + 1) * 0.5
+    tree_chance = (noise_tile(xs, zs, 0.2, base=999).astype(np.float64) + 1) * 0.5
+    return cactus_chance, tree_chance
+
+
+def _compute_column_tile(cx, cz):
+    """CHUNK_SIZE x CHUNK_SIZE Kachel für den Spalten-Cache."""
+    return compute_column_maps(cx * CHUNK_SIZE, cz * CHUNK_SIZE, CHUNK_SIZE)
+
+
+# Geteilter Cache: Neu geladene Chunks müssen die Noise nicht erneut berechnen
+COLUMN_CACHE = ColumnTileCache(_compute_column_tile, CHUNK_SIZE, max_tiles=COLUMN_CACHE_MAX_TILES)
+
+
+def fill_terrain_columns(heightmap, desert_mask):
+    """
+    Baut den kompletten Spalten-Stack (Stein/Erde/Gras/Sand/Wasser) vektorisiert auf.
+    Statt ~20k einzelner Python-Writes wird jede Schicht per Broadcast-Vergleich
+    der Heightmap gegen einen y-Index-Array bestimmt.
+
+    Die Karten haben Shape (..., X, Z), das Ergebnis (..., X, MAX_HEIGHT, Z).
+    So können auch viele Chunks einer Region in einem Aufruf gefüllt werden.
+    """
+    y = np.arange(MAX_HEIGHT, dtype=np.int32)[:, None]
+    h = heightmap[..., None, :]
+    desert = desert_mask[..., None, :]
+    # STRAND-CHECK: Oberfläche nah am Wasser -> Sand statt Gras/Erde
+    beach = (~desert_mask & (heightmap <= SEA_LEVEL + 2))[..., None, :]
+    grassland = ~(desert | beach)
+
+    solid = y < h
+    conditions = [
+        # A) LANDSCHAFT (Solide Blöcke)
+        solid & desert & (y >= h - 3),       # Wüste: Sand oben
+        solid & beach & (y >= h - 2),        # Strand: Sand oben
+        solid & grassland & (y == h - 1),    # Grasland: Gras
+        solid & grassland & (y >= h - 4),    # Grasland: Erde
+        solid,                               # Darunter überall Stein
+        # B) WASSER (Füllt Luft unter dem Meeresspiegel auf)
+        y <= SEA_LEVEL,
+    ]
+    choices = [ID_SAND, ID_SAND, ID_GRASS, ID_DIRT, ID_STONE, ID_WATER]
+
+    return np.select(conditions, choices, default=ID_AIR).astype(BLOCK_DTYPE)
+
+
+def surface_blocks(heightmap, desert_mask):
+    """
+    Oberste sichtbare Schicht pro Spalte nach denselben Regeln wie fill_terrain_columns,
+    ohne den 3D-Stack zu bauen. Rückgabe: (Oberkante in Blöcken, Block-ID).
+    """
+    underwater = heightmap <= SEA_LEVEL
+    beach = ~desert_mask & (heightmap <= SEA_LEVEL + 2)
+    top = np.where(underwater, SEA_LEVEL + 1, heightmap)
+    block_ids = np.select([underwater, desert_mask | beach], [ID_WATER, ID_SAND], default=ID_GRASS)
+    return top, block_ids.astype(BLOCK_DTYPE)
+
+
+def place_vegetation(block_data, heightmap, biome_map, cactus_chance, tree_chance, rng):
+    """Setzt Bäume und Kakteen in einen Chunk (alle Karten 16x16)."""
     TREE_PROBABILITY = 0.20
     CACTUS_PROBABILITY = 0.15
-    SAFETY_MARGIN = 2
-
-    for x in range(1, CHUNK_SIZE + 1):
-        for z in range(1, CHUNK_SIZE + 1):
-
-            if (x < SAFETY_MARGIN or x > CHUNK_SIZE + 1 - SAFETY_MARGIN or
-                    z < SAFETY_MARGIN or z > CHUNK_SIZE + 1 - SAFETY_MARGIN):
-                continue
+    # Abstand zum Chunk-Rand (Kronen werden am Rand abgeschnitten)
+    SAFETY_MARGIN = 1
 
-            wx = base_x + x
-            wz = base_z + z
+    for x in range(SAFETY_MARGIN, CHUNK_SIZE - SAFETY_MARGIN):
+        for z in range(SAFETY_MARGIN, CHUNK_SIZE - SAFETY_MARGIN):
 
             # Oberfläche bestimmen (Höchster Block - 1)
-            y_surface = heightmap[(x, z)] - 1
+            y_surface = int(heightmap[x, z]) - 1
 
             # WICHTIG: Keine Vegetation unter Wasser!
             if y_surface < SEA_LEVEL:
                 continue
 
-            is_desert = biome_map[(x, z)]
+            is_desert = biome_map[x, z]
 
             if is_desert:
                 # KAKTUS (Nur auf Sand)
                 if block_data[x, y_surface, z] == ID_SAND:
-                    chance = (pnoise2(wx * 0.5, wz * 0.5, base=888) + 1) * 0.5
-                    if chance < CACTUS_PROBABILITY:
-                        place_cactus(block_data, x, z, y_surface)
+                    if cactus_chance[x, z] < CACTUS_PROBABILITY:
+                        place_cactus(block_data, x, z, y_surface, rng)
             else:
                 # BAUM (Nur auf Gras)
                 # Durch die Strand-Logik wachsen Bäume jetzt automatisch nicht mehr am Strand,
                 # da dort Sand liegt, kein Gras.
                 if block_data[x, y_surface, z] == ID_GRASS:
-                    chance = (pnoise2(wx * 0.2, wz * 0.2, base=999) + 1) * 0.5
-                    if chance < TREE_PROBABILITY:
+                    if tree_chance[x, z] < TREE_PROBABILITY:
                         place_tree(block_data, x, z, y_surface)
 
-    return block_data
\ No newline at end of file
+
+def generate_chunk_block_data(cx, cz, world_seed=None):
+    if world_seed is None:
+        world_seed = WorldSeed()
+    rng = world_seed.chunk_rng(cx, cz)
+
+    # Noise wird im verschobenen Raum des Seeds ausgewertet
+    ncx, ncz = world_seed.noise_chunk(cx, cz)
+    base_x = ncx * CHUNK_SIZE
+    base_z = ncz * CHUNK_SIZE
+
+    # 1. Terrain & Biome Map Generierung (vektorisiert, Kachel aus dem Cache)
+    heightmap, biome_map = COLUMN_CACHE.get_tile(ncx, ncz)
+    block_data = fill_terrain_columns(heightmap, biome_map)
+
+    # 2. Vegetation (Bäume und Kakteen)
+    cactus_chance, tree_chance = compute_vegetation_maps(base_x, base_z)
+    place_vegetation(block_data, heightmap, biome_map, cactus_chance, tree_chance, rng)
+
+    return block_data
+
+
+def generate_region(cx0, cz0, w, h, world_seed=None):
+    """
+    Generiert einen zusammenhängenden Block von w x h Chunks ab (cx0, cz0).
+
+    Die Noise wird einmal über das gesamte Regions-Raster ausgewertet und das
+    Terrain in einem einzigen Broadcast gefüllt. Das Ergebnis liegt in EINEM
+    Array der Shape (w, h, 16, MAX_HEIGHT, 16); zurückgegeben wird
+    {(cx, cz): View}, bitgleich zu generate_chunk_block_data(cx, cz).
+    Die Views halten das Regions-Array am Leben, bis alle entladen sind.
+    """
+    if world_seed is None:
+        world_seed = WorldSeed()
+
+    ncx0, ncz0 = world_seed.noise_chunk(cx0, cz0)
+    base_x = ncx0 * CHUNK_SIZE
+    base_z = ncz0 * CHUNK_SIZE
+    size_x = w * CHUNK_SIZE
+    size_z = h * CHUNK_SIZE
+
+    # 1. Noise für die komplette Region
+    heightmap, biome_map = compute_column_maps(base_x, base_z, size_x, size_z)
+    cactus_chance, tree_chance = compute_vegetation_maps(base_x, base_z, size_x, size_z)
+
+    # In 16x16 Kacheln pro Chunk zerlegen -> Shape (w, h, 16, 16)
+    def tiles(layer):
+        return layer.reshape(w, CHUNK_SIZE, h, CHUNK_SIZE).transpose(0, 2, 1, 3)
+
+    heightmap_w = tiles(heightmap)
+    biome_w = tiles(biome_map)
+    cactus_w = tiles(cactus_chance)
+    tree_w = tiles(tree_chance)
+
+    # 2. Terrain aller Chunks in einem Aufruf
+    region = fill_terrain_columns(heightmap_w, biome_w)
+
+    # 3. Vegetation pro Chunk (eigener Zufallsstrom) + Kacheln für den Spalten-Cache
+    chunks = {}
+    for i in range(w):
+        for j in range(h):
+            cx, cz = cx0 + i, cz0 + j
+            block_data = region[i, j]
+            place_vegetation(block_data, heightmap_w[i, j], biome_w[i, j],
+                             cactus_w[i, j], tree_w[i, j], world_seed.chunk_rng(cx, cz))
+            COLUMN_CACHE.put(ncx0 + i, ncz0 + j, (heightmap_w[i, j].copy(), biome_w[i, j].copy()))
+            chunks[(cx, cz)] = block_data
+
+    return chunks
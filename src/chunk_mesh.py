@@ -1,32 +1,316 @@
 # --- src/chunk_mesh.py (KORRIGIERT FÜR V7) ---
+import threading
+from functools import lru_cache
+
 import numpy as np
 import concurrent.futures
+from multiprocessing import shared_memory
 
 from .geometry_constants import (
-    CUBE_VERTICES, CUBE_UVS, CUBE_NORMALS
+    CUBE_VERTICES, CUBE_UVS, CUBE_NORMALS, VERTEX_WORDS, PACKED_Y_MASK
 )
 
 from .chunk_data import (
-    CHUNK_SIZE, MAX_HEIGHT, RENDER_DISTANCE_CHUNKS, ID_AIR,
-    generate_chunk_block_data  # Für den Worker
+    CHUNK_SIZE, MAX_HEIGHT, RENDER_DISTANCE_CHUNKS, ID_AIR, BLOCK_DATA_SHAPE, BLOCK_DTYPE,
+    generate_chunk_block_data, generate_region  # Für den Worker
+)
+
+from .block_definitions import BLOCKS, BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCK_LIGHT_ATTENUATION
+from .chunk_neighborhood import gather_padded, section_mesh_mask, mesh_input_sections
+from .chunk_sections import SECTION_SIZE
+from .lighting_system import compute_corner_light_grid, corner_light_grid_shape
+from .greedy_mesh import generate_face_culling_mesh_v7, generate_greedy_mesh, generate_masked_faces, max_mesh_faces
+from .section_mesh import face_voxel_boxes, quad_indices
+from .mesh_cache import mesh_cache_key, mesher_fingerprint
+from .lod_mesh import (
+    LOD_FACTORS, lod_cells_shape, lod_skirt_cells, downsample_blocks, downsample_light, generate_lod_mesh
 )
 
-from .greedy_mesh import generate_face_culling_mesh_v7  # V7 statt v6!
+# Mesh-Modus: "greedy" fasst gleiche Flächen zu großen Quads zusammen,
+# "culling" erzeugt ein Quad pro sichtbarer Blockfläche (alter V7-Mesher)
+MESH_MODE_GREEDY = "greedy"
+MESH_MODE_CULLING = "culling"
+MESH_MODE = MESH_MODE_GREEDY
+
+# True: Licht + AO aller Ecken vor dem Meshen pro Chunk vorberechnen (vektorisiert),
+# False: pro sichtbarer Fläche direkt sampeln
+CORNER_LIGHT_GRID = False
 
 # --- Worker-Wrapper (Threading) ---
 
-def block_data_worker_wrapper(cx, cz):
+def block_data_worker_wrapper(cx, cz, world_seed=None):
     """Wrapper für die Blockdaten-Generierung im Thread-Pool."""
     try:
-        return generate_chunk_block_data(cx, cz)
+        return generate_chunk_block_data(cx, cz, world_seed)
+    except Exception as e:
+        return Exception(f"Fehler in BlockData-Worker für ({cx},{cz}): {e}")
+
+
+def block_data_shm_worker(cx, cz, shm_name, world_seed=None):
+    """
+    Wrapper für die Blockdaten-Generierung im Prozess-Pool.
+    Schreibt das Ergebnis direkt in den Shared-Memory-Block shm_name.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            out = np.ndarray(BLOCK_DATA_SHAPE, dtype=BLOCK_DTYPE, buffer=shm.buf)
+            out[...] = generate_chunk_block_data(cx, cz, world_seed)
+            del out
+        finally:
+            shm.close()
+        return None
     except Exception as e:
         return Exception(f"Fehler in BlockData-Worker für ({cx},{cz}): {e}")
 
 
-def mesh_worker_wrapper(cx, cz, block_data, light_map):
-    """Wrapper für die Mesh-Generierung im Thread-Pool."""
+def region_worker_wrapper(cx0, cz0, w, h, world_seed=None):
+    """Wrapper für die Regions-Generierung im Thread-Pool."""
+    try:
+        return generate_region(cx0, cz0, w, h, world_seed)
+    except Exception as e:
+        return Exception(f"Fehler in Region-Worker für ({cx0},{cz0}) {w}x{h}: {e}")
+
+
+def region_shm_worker(cx0, cz0, w, h, shm_name, world_seed=None):
+    """Wrapper für die Regions-Generierung im Prozess-Pool (Ergebnis im Shared Memory)."""
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            out = np.ndarray((w, h) + BLOCK_DATA_SHAPE, dtype=BLOCK_DTYPE, buffer=shm.buf)
+            for (cx, cz), block_data in generate_region(cx0, cz0, w, h, world_seed).items():
+                out[cx - cx0, cz - cz0] = block_data
+            del out
+        finally:
+            shm.close()
+        return None
+    except Exception as e:
+        return Exception(f"Fehler in Region-Worker für ({cx0},{cz0}) {w}x{h}: {e}")
+
+
+class MeshScratch:
+    """
+    Wiederverwendbare Arbeits- und Ausgabe-Puffer eines Mesh-Workers.
+
+    Die Puffer sind für den schlimmsten Fall (jede Blockseite sichtbar) ausgelegt
+    und werden pro Thread nur einmal angelegt. Zurückgegeben werden kompakte
+    Kopien, der Puffer selbst verlässt den Worker nie.
+    """
+
+    def __init__(self, height):
+        if height > PACKED_Y_MASK:
+            raise ValueError(f"Welthöhe {height} passt nicht ins gepackte Vertex-Format (max. {PACKED_Y_MASK})")
+        self.height = height
+        max_faces = max_mesh_faces(height)
+        self.vertices = np.empty(max_faces * 4 * VERTEX_WORDS, dtype=np.uint32)
+        self.indices = np.empty(max_faces * 6, dtype=np.uint32)
+
+        layer_shape = (CHUNK_SIZE, height, CHUNK_SIZE)
+        self.visible = np.zeros(layer_shape, dtype=np.bool_)
+        self.done = np.zeros(layer_shape, dtype=np.bool_)
+        self.uniform = np.zeros(layer_shape, dtype=np.bool_)
+        self.tex = np.zeros(layer_shape, dtype=np.float32)
+        self.light = np.zeros(layer_shape + (4,), dtype=np.float32)
+
+        self.corner_light = np.zeros(corner_light_grid_shape(CHUNK_SIZE + 2, height, CHUNK_SIZE + 2))
+        self.no_corner_light = np.zeros((0, 0, 0, 0))
+
+    def result(self, face_count):
+        """Kompakte Kopie der ersten face_count Flächen als (vertices (N, VERTEX_WORDS) uint32, indices)."""
+        vertices = self.vertices[:face_count * 4 * VERTEX_WORDS].reshape(-1, VERTEX_WORDS).copy()
+        indices = self.indices[:face_count * 6].copy()
+        return vertices, indices
+
+
+_scratch = threading.local()
+
+
+def get_mesh_scratch(height):
+    """MeshScratch des aktuellen Threads (bzw. Prozesses), bei anderer Welthöhe neu angelegt."""
+    scratch = getattr(_scratch, "mesh", None)
+    if scratch is None or scratch.height != height:
+        scratch = MeshScratch(height)
+        _scratch.mesh = scratch
+    return scratch
+
+
+def mesh_worker_wrapper(cx, cz, block_data, light_map, section_mask=None):
+    """Wrapper für die Mesh-Generierung im Thread-Pool (block_data/light_map gepaddet)."""
+    try:
+        height = block_data.shape[1]
+        if section_mask is None:
+            section_mask = np.ones(height // SECTION_SIZE, dtype=np.bool_)
+        scratch = get_mesh_scratch(height)
+        if CORNER_LIGHT_GRID:
+            corner_light = compute_corner_light_grid(light_map, block_data, BLOCK_LIGHT_ATTENUATION,
+                                                     scratch.corner_light)
+        else:
+            corner_light = scratch.no_corner_light
+        if MESH_MODE == MESH_MODE_GREEDY:
+            face_count = generate_greedy_mesh(
+                block_data, light_map, corner_light,
+                BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCK_LIGHT_ATTENUATION, section_mask,
+                scratch.vertices, scratch.indices,
+                scratch.visible, scratch.done, scratch.uniform, scratch.tex, scratch.light
+            )
+        else:
+            face_count = generate_face_culling_mesh_v7(
+                block_data, light_map, corner_light,
+                BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCK_LIGHT_ATTENUATION, section_mask,
+                scratch.vertices, scratch.indices
+            )
+        return scratch.result(face_count)
+    except Exception as e:
+        return Exception(f"Fehler in Mesh-Worker für ({cx},{cz}): {e}")
+
+
+@lru_cache(maxsize=None)
+def _mesher_fingerprint(mesh_mode, corner_light_grid):
+    """Fingerabdruck für den Mesh-Cache (die Block-Tabellen stehen nach dem Import fest)."""
+    return mesher_fingerprint(mesh_mode, corner_light_grid,
+                              BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCK_LIGHT_ATTENUATION)
+
+
+def mesh_snapshot_worker(cx, cz, blocks, lights, sections=None, cache=None):
+    """
+    Mesht Chunk (cx, cz) aus Snapshots seiner 3x3 Nachbarschaft, Section für Section.
+    blocks / lights: {coord: SectionedChunk-Snapshot bzw. Lichtkarte}, vom
+    Hauptthread erstellt und danach unveränderlich. Das Zusammensetzen des
+    Rands läuft so im Worker statt im Hauptthread.
+
+    sections: Indizes der neu zu meshenden 16er-Sections (None = alle). Aus
+    den Nachbarn werden dann nur diese Sections (± 1) gelesen und entpackt.
+    Rückgabe: {section: (vertices, indices)}; leere oder verdeckte Sections
+    liefern leere Arrays, damit ihr altes Mesh gelöscht wird.
+
+    cache: optionaler MeshCache. Bei einem Treffer wird die Section nicht
+    gemesht, die Vertices kommen memory-mapped von der Platte.
+    """
     try:
-        # WICHTIG: Nutze v7 mit Flat Lighting!
-        return generate_face_culling_mesh_v7(cx, cz, block_data, light_map)
+        coord = (cx, cz)
+        section_mask = section_mesh_mask(blocks, coord, BLOCKS.opaque)
+        if sections is None:
+            sections = range(section_mask.shape[0])
+            input_sections = None
+        else:
+            input_sections = mesh_input_sections(sections, section_mask.shape[0])
+        block_data = gather_padded(blocks, coord, input_sections)
+        light_map = gather_padded(lights, coord, input_sections)
+    except Exception as e:
+        return Exception(f"Fehler beim Vorbereiten des Meshes für ({cx},{cz}): {e}")
+
+    fingerprint = _mesher_fingerprint(MESH_MODE, CORNER_LIGHT_GRID)
+    results = {}
+    for section in sections:
+        # Leere/verdeckte Sections kosten fast nichts und landen nicht im Cache
+        use_cache = cache is not None and section_mask[section]
+        if use_cache:
+            key = mesh_cache_key(block_data, light_map, section, fingerprint)
+            vertices = cache.get(key)
+            if vertices is not None:
+                results[section] = (vertices, quad_indices(vertices.shape[0] // 4))
+                continue
+
+        single = np.zeros_like(section_mask)
+        single[section] = section_mask[section]
+        res = mesh_worker_wrapper(cx, cz, block_data, light_map, single)
+        if isinstance(res, Exception):
+            return res
+        if use_cache:
+            cache.put(key, res[0])
+        results[section] = res
+    return results
+
+
+def _section_patch(block_data, light_map, corner_light, scratch, vertices, section, lo, hi):
+    """
+    Patch einer Section für den Voxel-Bereich [lo, hi) (chunk-lokal, innerhalb der Section).
+    Entfernt wird jede Fläche, die den Bereich berührt. Ein so zerschnittenes
+    Greedy-Quad kommt für seine übrigen Voxel als Einzelflächen zurück.
+    """
+    faces, face_lo, face_hi = face_voxel_boxes(vertices)
+    removed = np.flatnonzero(np.all(face_lo < hi, axis=1) & np.all(face_hi > lo, axis=1))
+
+    y0 = section * SECTION_SIZE
+    face_mask = np.zeros((6, CHUNK_SIZE, SECTION_SIZE, CHUNK_SIZE), dtype=np.bool_)
+    face_mask[:, lo[0]:hi[0], lo[1] - y0:hi[1] - y0, lo[2]:hi[2]] = True
+    for k in removed:
+        (x0, ya, z0), (x1, yb, z1) = face_lo[k], face_hi[k]
+        face_mask[faces[k], x0:x1, ya - y0:yb - y0, z0:z1] = True
+
+    face_count = generate_masked_faces(
+        block_data, light_map, corner_light,
+        BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCK_LIGHT_ATTENUATION, face_mask, y0,
+        scratch.vertices, scratch.indices
+    )
+    return removed, scratch.result(face_count)[0]
+
+
+def mesh_patch_worker(cx, cz, blocks, lights, lo, hi, section_faces):
+    """
+    In-Place-Patch statt Neu-Meshen nach einer Block-Änderung: liefert für jede
+    Section, die den Voxel-Bereich [lo, hi) (chunk-lokal) schneidet, die zu
+    entfernenden Flächen-Slots und die neuen Einzelflächen.
+    section_faces: {section: aktuelle Vertices} (siehe SectionMesh.faces),
+    fehlende Sections gelten als leer. Läuft im Hauptthread, die Änderung ist
+    so im selben Frame sichtbar, auch wenn der Thread-Pool ausgelastet ist.
+    Rückgabe: {section: (removed, new_vertices)}.
+    """
+    try:
+        coord = (cx, cz)
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        height = blocks[coord].shape[1]
+        sections = range(lo[1] // SECTION_SIZE, (hi[1] - 1) // SECTION_SIZE + 1)
+        input_sections = mesh_input_sections(sections, height // SECTION_SIZE)
+        block_data = gather_padded(blocks, coord, input_sections)
+        light_map = gather_padded(lights, coord, input_sections)
+
+        scratch = get_mesh_scratch(height)
+        if CORNER_LIGHT_GRID:
+            corner_light = compute_corner_light_grid(light_map, block_data, BLOCK_LIGHT_ATTENUATION,
+                                                     scratch.corner_light)
+        else:
+            corner_light = scratch.no_corner_light
+
+        empty = np.zeros((0, VERTEX_WORDS), dtype=np.uint32)
+        patches = {}
+        for section in sections:
+            y0 = section * SECTION_SIZE
+            section_lo = lo.copy()
+            section_hi = hi.copy()
+            section_lo[1] = max(lo[1], y0)
+            section_hi[1] = min(hi[1], y0 + SECTION_SIZE)
+            patches[section] = _section_patch(block_data, light_map, corner_light, scratch,
+                                              section_faces.get(section, empty), section, section_lo, section_hi)
+        return patches
+    except Exception as e:
+        return Exception(f"Fehler beim Patchen des Meshes für ({cx},{cz}): {e}")
+
+
+def lod_mesh_worker(cx, cz, blocks, lights, level):
+    """
+    Vergröbertes Mesh (LOD-Stufe level > 0, siehe LOD_FACTORS) für Chunk (cx, cz)
+    aus Snapshots seiner 3x3 Nachbarschaft wie mesh_snapshot_worker.
+    Rückgabe: {0: (vertices, indices)}, der ganze Chunk liegt als ein Mesh in Slot 0.
+    """
+    try:
+        coord = (cx, cz)
+        factor = LOD_FACTORS[level]
+        block_data = gather_padded(blocks, coord, pad=factor)
+        light_map = gather_padded(lights, coord, pad=factor)
+
+        cells_shape = lod_cells_shape(block_data.shape, factor)
+        cells = np.empty(cells_shape, dtype=BLOCK_DTYPE)
+        cell_light = np.empty(cells_shape + light_map.shape[3:], dtype=light_map.dtype)
+        downsample_blocks(block_data, factor, cells)
+        downsample_light(light_map, factor, cell_light)
+
+        scratch = get_mesh_scratch(block_data.shape[1])
+        face_count = generate_lod_mesh(
+            cells, cell_light, factor, BLOCK_FACE_TEXTURES, BLOCK_FACE_VISIBLE, BLOCKS.opaque,
+            lod_skirt_cells(factor), scratch.vertices, scratch.indices
+        )
+        return {0: scratch.result(face_count)}
     except Exception as e:
-        return Exception(f"Fehler in Mesh-Worker für ({cx},{cz}): {e}")
\ No newline at end of file
+        return Exception(f"Fehler in LOD-Mesh-Worker für ({cx},{cz}) Stufe {level}: {e}")
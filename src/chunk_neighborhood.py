@@ -0,0 +1,146 @@
+# --- src/chunk_neighborhood.py ---
+import numpy as np
+
+from .block_definitions import ID_AIR
+from .chunk_sections import SectionedChunk, SECTION_SIZE
+
+
+def _rows(sections):
+    return slice(sections.start * SECTION_SIZE, sections.stop * SECTION_SIZE)
+
+
+def _slab(chunk, xs, zs, sections):
+    """Ausschnitt chunk[xs, :, zs] aus einem dichten Array oder einem SectionedChunk."""
+    if isinstance(chunk, SectionedChunk):
+        return chunk.slab(xs, zs, sections)
+    return chunk[xs, :, zs] if sections is None else chunk[xs, _rows(sections), zs]
+
+
+def _dense(chunk, sections=None):
+    if isinstance(chunk, SectionedChunk):
+        return chunk.to_dense(sections)
+    return chunk if sections is None else chunk[:, _rows(sections)]
+
+
+def mesh_input_sections(sections, count):
+    """
+    Zusammenhängender Bereich an Sections, den das Meshen der Sections braucht:
+    die Sections selbst plus je eine darüber und darunter (Flächen und AO lesen
+    eine Zeile über die Section-Grenze hinaus).
+    """
+    return range(max(min(sections) - 1, 0), min(max(sections) + 2, count))
+
+
+def gather_padded(chunks, coord, sections=None, pad=1):
+    """
+    Baut für den Chunk coord ein gepaddetes Array (CHUNK_SIZE + 2 * pad in X und Z)
+    aus den 3x3 Nachbarn zusammen. Funktioniert für Blockdaten (x, y, z) und
+    Lichtkarten (x, y, z, kanal); chunks ist ein Dict {coord: Chunk}.
+
+    Gespeichert wird jeder Chunk ohne Rand, der Rand existiert nur in dieser
+    temporären Kopie für Mesher und Licht-Kernel. Fehlt ein Nachbar (noch nicht
+    geladen), wird die eigene Randschicht fortgesetzt; sobald er geladen ist,
+    wird der Chunk neu gemesht.
+
+    sections: range von Section-Indizes (siehe mesh_input_sections). Dann
+    werden nur diese Zeilen aus den Nachbarn gelesen und entpackt, der Rest
+    des Arrays bleibt 0 (Luft / kein Licht).
+
+    pad: Randbreite, 1 für Mesher und Licht; die LOD-Mesher brauchen eine
+    ganze (vergröberte) Zelle der Nachbarn.
+    """
+    center = _dense(chunks[coord], sections)
+    size = center.shape[0]
+    cx, cz = coord
+    neighbors = {(dx, dz): chunks.get((cx + dx, cz + dz)) for dx in (-1, 0, 1) for dz in (-1, 0, 1) if dx or dz}
+    if all(n is not None for n in neighbors.values()):
+        # Rand wird komplett überschrieben, np.pad (edge) wäre bei breitem Rand teuer
+        padded = np.empty((size + 2 * pad,) + center.shape[1:2] + (size + 2 * pad,) + center.shape[3:],
+                          dtype=center.dtype)
+        padded[pad:size + pad, :, pad:size + pad] = center
+    else:
+        widths = [(pad, pad), (0, 0), (pad, pad)] + [(0, 0)] * (center.ndim - 3)
+        padded = np.pad(center, widths, mode="edge")
+
+    # (Zielbereich im gepaddeten Array, Quellbereich im Nachbarn)
+    spans = {
+        -1: (slice(0, pad), slice(size - pad, size)),
+        1: (slice(size + pad, size + 2 * pad), slice(0, pad)),
+        0: (slice(pad, size + pad), slice(0, size)),
+    }
+
+    for dx, (dst_x, src_x) in spans.items():
+        for dz, (dst_z, src_z) in spans.items():
+            if dx == 0 and dz == 0:
+                continue
+            neighbor = neighbors[(dx, dz)]
+            if neighbor is not None:
+                padded[dst_x, :, dst_z] = _slab(neighbor, src_x, src_z, sections)
+
+    if sections is None:
+        return padded
+
+    height = chunks[coord].shape[1]
+    full = np.zeros((size + 2 * pad, height) + padded.shape[2:], dtype=padded.dtype)
+    full[:, _rows(sections)] = padded
+    return full
+
+
+def neighbor_coords(coord, diagonal=True):
+    """Die 4 (bzw. 8) Nachbarkoordinaten eines Chunks."""
+    cx, cz = coord
+    if not diagonal:
+        return [(cx - 1, cz), (cx + 1, cz), (cx, cz - 1), (cx, cz + 1)]
+    return [(cx + dx, cz + dz) for dx in (-1, 0, 1) for dz in (-1, 0, 1) if dx or dz]
+
+
+def _section_palettes(chunk):
+    """Vorkommende IDs pro 16er-Section (aus der Palette oder per np.unique bei dichten Arrays)."""
+    if isinstance(chunk, SectionedChunk):
+        return [chunk.section_palette(i) for i in range(chunk.section_count)]
+    return [np.unique(chunk[:, y0:y0 + SECTION_SIZE, :]) for y0 in range(0, chunk.shape[1], SECTION_SIZE)]
+
+
+def section_mesh_mask(chunks, coord, opaque):
+    """
+    bool pro Section des Chunks coord: muss sie gemesht werden?
+
+    Übersprungen werden reine Luft-Sections und komplett undurchsichtige
+    Sections, deren 6 Nachbar-Sections ebenfalls komplett undurchsichtig sind
+    (dort kann keine Fläche sichtbar sein). Die Prüfung ist konservativ,
+    es wird nie eine sichtbare Fläche verworfen.
+    """
+    palettes = _section_palettes(chunks[coord])
+    empty = np.array([p.size == 1 and p[0] == ID_AIR for p in palettes])
+    full = np.array([bool(opaque[p].all()) for p in palettes])
+
+    # Oben und unten am Welt-Rand werden Flächen immer gezeichnet
+    enclosed = full.copy()
+    enclosed[0] = enclosed[-1] = False
+    enclosed[1:-1] &= full[:-2] & full[2:]
+
+    # Fehlende Nachbarn setzen den eigenen Rand fort und gelten daher als voll
+    for n in neighbor_coords(coord, diagonal=False):
+        if not enclosed.any():
+            break
+        neighbor = chunks.get(n)
+        if neighbor is None:
+            continue
+        n_palettes = _section_palettes(neighbor)
+        for i in np.flatnonzero(enclosed):
+            enclosed[i] = bool(opaque[n_palettes[i]].all())
+
+    return ~empty & ~enclosed
+
+
+def affected_sections(rows, height):
+    """
+    Sections, deren Mesh sich ändert, wenn sich Blöcke oder Licht in den Y-Zeilen rows
+    ändern. Flächen und AO an einer Section-Grenze lesen die Zeile darüber/darunter mit,
+    daher zählt jede Zeile auch für die Nachbar-Section.
+    """
+    touched = np.zeros(height, dtype=np.bool_)
+    touched[np.asarray(rows, dtype=np.int64)] = True
+    touched[1:] |= touched[:-1].copy()
+    touched[:-1] |= touched[1:].copy()
+    return set(np.flatnonzero(touched.reshape(-1, SECTION_SIZE).any(axis=1)).tolist())
@@ -0,0 +1,256 @@
+# --- src/chunk_sections.py ---
+from functools import lru_cache
+
+import numpy as np
+
+from .block_definitions import BLOCK_DTYPE
+
+SECTION_SIZE = 16
+
+# Mögliche Bits pro Palette-Index (müssen 8 teilen oder 16 sein)
+_INDEX_BITS = (1, 2, 4, 8, 16)
+
+
+class PaletteArray:
+    """
+    Komprimiertes 3D/2D-Array aus Block-IDs.
+
+    Entweder uniform (eine einzige ID, kein Speicher pro Voxel) oder
+    Palette + bit-gepackte Indizes (1, 2, 4, 8 oder 16 Bit pro Voxel).
+    """
+
+    __slots__ = ("shape", "size", "uniform_id", "palette", "bits", "packed")
+
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        self.size = int(np.prod(self.shape))
+        self.uniform_id = 0
+        self.palette = None
+        self.bits = 0
+        self.packed = None
+
+    @classmethod
+    def from_dense(cls, dense):
+        arr = cls(dense.shape)
+        arr.encode(dense)
+        return arr
+
+    def copy(self):
+        arr = PaletteArray(self.shape)
+        arr.uniform_id = self.uniform_id
+        arr.bits = self.bits
+        if not self.is_uniform:
+            arr.palette = self.palette.copy()
+            arr.packed = self.packed.copy()
+        return arr
+
+    @property
+    def is_uniform(self):
+        return self.palette is None
+
+    @property
+    def nbytes(self):
+        if self.is_uniform:
+            return 0
+        return self.palette.nbytes + self.packed.nbytes
+
+    def encode(self, dense):
+        flat = np.ascontiguousarray(dense).ravel()
+        first = flat[0]
+        if (flat == first).all():
+            self.uniform_id = int(first)
+            self.palette = None
+            self.bits = 0
+            self.packed = None
+            return
+
+        palette, inverse = np.unique(flat, return_inverse=True)
+        bits = next(b for b in _INDEX_BITS if len(palette) <= (1 << b))
+        self.palette = palette.astype(BLOCK_DTYPE)
+        self.bits = bits
+
+        if bits == 16:
+            self.packed = inverse.astype(np.uint16)
+            return
+
+        per_byte = 8 // bits
+        padded = np.zeros(-(-self.size // per_byte) * per_byte, dtype=np.uint8)
+        padded[:self.size] = inverse
+        shifts = (np.arange(per_byte, dtype=np.uint8) * bits)
+        self.packed = np.bitwise_or.reduce(padded.reshape(-1, per_byte) << shifts, axis=1).astype(np.uint8)
+
+    def to_dense(self):
+        if self.is_uniform:
+            return np.full(self.shape, self.uniform_id, dtype=BLOCK_DTYPE)
+        if self.bits == 16:
+            indices = self.packed
+        else:
+            per_byte = 8 // self.bits
+            shifts = (np.arange(per_byte, dtype=np.uint8) * self.bits)
+            mask = (1 << self.bits) - 1
+            indices = ((self.packed[:, None] >> shifts) & mask).ravel()[:self.size]
+        return self.palette[indices].reshape(self.shape)
+
+    def get(self, i):
+        """Liest den Voxel mit flachem (C-Order) Index i."""
+        if self.is_uniform:
+            return self.uniform_id
+        if self.bits == 16:
+            return int(self.palette[self.packed[i]])
+        per_byte = 8 // self.bits
+        shift = (i % per_byte) * self.bits
+        index = (int(self.packed[i // per_byte]) >> shift) & ((1 << self.bits) - 1)
+        return int(self.palette[index])
+
+    def take(self, indices):
+        """Liest viele Voxel auf einmal (flache Indizes als Array), ohne alles zu entpacken."""
+        if self.is_uniform:
+            return np.full(indices.shape, self.uniform_id, dtype=BLOCK_DTYPE)
+        if self.bits == 16:
+            return self.palette[self.packed[indices]]
+        per_byte = 8 // self.bits
+        shifts = ((indices % per_byte) * self.bits).astype(np.uint8)
+        index = (self.packed[indices // per_byte] >> shifts) & ((1 << self.bits) - 1)
+        return self.palette[index]
+
+    def set(self, i, block_id):
+        """Schreibt den Voxel mit flachem Index i (in-place, falls die ID schon in der Palette ist)."""
+        block_id = int(block_id)
+        if self.is_uniform:
+            if block_id == self.uniform_id:
+                return
+        else:
+            hits = np.flatnonzero(self.palette == block_id)
+            if hits.size:
+                index = int(hits[0])
+                if self.bits == 16:
+                    self.packed[i] = index
+                    return
+                per_byte = 8 // self.bits
+                shift = (i % per_byte) * self.bits
+                mask = ((1 << self.bits) - 1) << shift
+                byte = int(self.packed[i // per_byte])
+                self.packed[i // per_byte] = (byte & ~mask & 0xFF) | (index << shift)
+                return
+
+        # Neue ID: Palette erweitern (ggf. mehr Bits) über einen Umweg durchs dichte Array
+        dense = self.to_dense().ravel()
+        dense[i] = block_id
+        self.encode(dense.reshape(self.shape))
+
+
+@lru_cache(maxsize=64)
+def _slab_indices(chunk_size, x_start, x_stop, z_start, z_stop):
+    """Flache Indizes innerhalb einer Section für slab(), Shape (len(xs), 16, len(zs))."""
+    x_idx = np.arange(x_start, x_stop)
+    z_idx = np.arange(z_start, z_stop)
+    y_idx = np.arange(SECTION_SIZE)
+    return (x_idx[:, None, None] * SECTION_SIZE + y_idx[None, :, None]) * SECTION_SIZE + z_idx[None, None, :]
+
+
+class SectionedChunk:
+    """
+    Chunk-Speicher aus 16x16x16-Sections (Minecraft-Style), ohne Rand.
+
+    Jede Section ist einzeln komprimiert; leere oder volle Sections kosten
+    praktisch keinen Speicher und können übersprungen werden.
+
+    Zugriff wie beim dichten Array:
+        chunk[x, y, z]          (0 <= x, z < CHUNK_SIZE)
+        chunk[x, y, z] = id
+    Für Kernel (Mesher, Licht) liefert to_dense() eine dichte Kopie,
+    slab() nur einen Ausschnitt (z.B. den Rand für einen Nachbarn).
+
+    snapshot() liefert ohne Datenkopie eine unveränderliche Sicht für Worker-Threads
+    (Copy-on-Write: erst ein späterer Schreibzugriff kopiert die betroffene Section).
+    """
+
+    __slots__ = ("chunk_size", "max_height", "shape", "sections", "_shared")
+
+    def __init__(self, chunk_size, max_height):
+        if chunk_size != SECTION_SIZE or max_height % SECTION_SIZE != 0:
+            raise ValueError("SectionedChunk erwartet CHUNK_SIZE = 16 und MAX_HEIGHT als Vielfaches von 16")
+        self.chunk_size = chunk_size
+        self.max_height = max_height
+        self.shape = (chunk_size, max_height, chunk_size)
+        self.sections = []
+        # Sections, die (auch) zu einem Snapshot gehören und vor dem Schreiben kopiert werden
+        self._shared = set()
+
+    @classmethod
+    def from_dense(cls, dense):
+        chunk = cls(dense.shape[0], dense.shape[1])
+        chunk.sections = [
+            PaletteArray.from_dense(dense[:, y0:y0 + SECTION_SIZE, :])
+            for y0 in range(0, chunk.max_height, SECTION_SIZE)
+        ]
+        return chunk
+
+    def snapshot(self):
+        """Nur-Lese-Kopie für Hintergrund-Jobs; teilt alle Sections bis zum nächsten Schreiben."""
+        snap = SectionedChunk(self.chunk_size, self.max_height)
+        snap.sections = list(self.sections)
+        self._shared = set(range(len(self.sections)))
+        return snap
+
+    def to_dense(self, sections=None):
+        """Dichte Kopie; mit sections (range von Section-Indizes) nur dieser Y-Bereich."""
+        sections = range(len(self.sections)) if sections is None else sections
+        dense = np.empty((self.chunk_size, len(sections) * SECTION_SIZE, self.chunk_size), dtype=BLOCK_DTYPE)
+        for k, i in enumerate(sections):
+            dense[:, k * SECTION_SIZE:(k + 1) * SECTION_SIZE, :] = self.sections[i].to_dense()
+        return dense
+
+    def slab(self, xs, zs, sections=None):
+        """Dichte Kopie von chunk[xs, :, zs] (xs, zs als slice), liest nur die nötigen Voxel."""
+        x_start, x_stop, _ = xs.indices(self.chunk_size)
+        z_start, z_stop, _ = zs.indices(self.chunk_size)
+        flat = _slab_indices(self.chunk_size, x_start, x_stop, z_start, z_stop)
+
+        sections = range(len(self.sections)) if sections is None else sections
+        out = np.empty((flat.shape[0], len(sections) * SECTION_SIZE, flat.shape[2]), dtype=BLOCK_DTYPE)
+        for k, i in enumerate(sections):
+            out[:, k * SECTION_SIZE:(k + 1) * SECTION_SIZE, :] = self.sections[i].take(flat)
+        return out
+
+    def _locate(self, key):
+        x, y, z = key
+        x, y, z = int(x), int(y), int(z)
+        if not (0 <= x < self.chunk_size and 0 <= y < self.max_height and 0 <= z < self.chunk_size):
+            raise IndexError(f"Block-Index {key} außerhalb von {self.shape}")
+        return y // SECTION_SIZE, (x * SECTION_SIZE + (y % SECTION_SIZE)) * SECTION_SIZE + z
+
+    def __getitem__(self, key):
+        section, i = self._locate(key)
+        return BLOCK_DTYPE(self.sections[section].get(i))
+
+    def __setitem__(self, key, block_id):
+        section, i = self._locate(key)
+        if section in self._shared:
+            self.sections[section] = self.sections[section].copy()
+            self._shared.discard(section)
+        self.sections[section].set(i, block_id)
+
+    # --- Accessoren für Mesher / Licht ---
+    @property
+    def section_count(self):
+        return len(self.sections)
+
+    def section_uniform_id(self, index):
+        """ID einer uniformen Section, sonst None (z.B. um reine Luft zu überspringen)."""
+        section = self.sections[index]
+        return section.uniform_id if section.is_uniform else None
+
+    def section_palette(self, index):
+        """Alle IDs, die in einer Section vorkommen (uniform: genau eine)."""
+        section = self.sections[index]
+        if section.is_uniform:
+            return np.array([section.uniform_id], dtype=BLOCK_DTYPE)
+        return section.palette
+
+    def section_dense(self, index):
+        return self.sections[index].to_dense()
+
+    @property
+    def nbytes(self):
+        return sum(s.nbytes for s in self.sections)
@@ -0,0 +1,64 @@
+# --- src/column_cache.py ---
+import threading
+from collections import OrderedDict
+
+
+class ColumnTileCache:
+    """
+    Thread-sicherer, begrenzter LRU-Cache für 2D-Spaltenkacheln (Heightmap, Biom-Maske).
+
+    Pro Chunk (cx, cz) wird eine CHUNK_SIZE x CHUNK_SIZE Kachel gespeichert, damit
+    entladene und wieder geladene Chunks die Noise nicht erneut berechnen müssen.
+    """
+
+    def __init__(self, compute_tile, tile_size, max_tiles=4096):
+        # compute_tile(cx, cz) -> Tupel von 2D-Arrays mit Shape (tile_size, tile_size)
+        self.compute_tile = compute_tile
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+
+        self._tiles = OrderedDict()  # {(cx, cz): (heightmap, desert_mask, ...)}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_tile(self, cx, cz):
+        """Liefert die Kachel für (cx, cz), berechnet sie bei Bedarf."""
+        key = (cx, cz)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+
+        # Außerhalb des Locks rechnen, damit andere Worker nicht blockieren.
+        # Rechnen zwei Threads dieselbe Kachel, gewinnt einfach der letzte.
+        tile = self.compute_tile(cx, cz)
+        self.put(cx, cz, tile)
+        return tile
+
+    def put(self, cx, cz, tile):
+        """Legt eine extern berechnete Kachel ab (z.B. aus einer Regions-Generierung)."""
+        with self._lock:
+            self._tiles[(cx, cz)] = tile
+            self._tiles.move_to_end((cx, cz))
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+
+    def stats(self):
+        """Gibt Trefferstatistik zurück: {'hits', 'misses', 'hit_rate', 'tiles'}."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'tiles': len(self._tiles),
+            }
@@ -4,10 +4,10 @@ from OpenGL.GL import *
 import numpy as np
 from pyrr import Matrix44
 
-from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, ID_AIR
+from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, ID_AIR, COLUMN_CACHE
 from src.opengl_core import (
     setup_textures,
-    LineRenderer, GUIRenderer
+    LineRenderer, GUIRenderer, HorizonRenderer
 )
 
 # Optionaler Renderer
@@ -18,11 +18,12 @@ try:
 except ImportError:
     HAS_CRACK_RENDERER = False
 
-from src.block_definitions import BLOCK_HARDNESS, DEFAULT_HARDNESS, ID_GRASS, ID_WATER
+from src.block_definitions import BLOCK_HARDNESS, ID_GRASS, ID_WATER
 
 # --- Manager Imports ---
 from src.managers.chunk_manager import ChunkManager
 from src.managers.item_manager import ItemManager
+from src.managers.horizon_manager import HorizonManager
 from src.input_handler import InputHandler
 from src.player import Player
 from src.item_renderer import ItemRenderer
@@ -45,6 +46,8 @@ class GameWorld:
         # NEU: ItemRenderer VOR ItemManager erstellen!
         self.item_renderer = ItemRenderer()
         self.item_manager = ItemManager(self.item_renderer)  # GEÄNDERT: Renderer übergeben
+        # Horizont jenseits der geladenen Chunks (nur 2D-Noise, siehe horizon.py)
+        self.horizon_manager = HorizonManager(HorizonRenderer(), self.chunk_manager.world_seed)
 
         # --- Renderer ---
         self.line_renderer = LineRenderer()
@@ -99,6 +102,7 @@ class GameWorld:
         self.view_loc = glGetUniformLocation(shader, "view")
         self.proj_loc = glGetUniformLocation(shader, "projection")
         self.model_loc = glGetUniformLocation(shader, "model")
+        self.chunk_offset_loc = glGetUniformLocation(shader, "u_chunk_offset")
 
         self.projection = Matrix44.perspective_projection(self.player.fovy, width / height, self.player.near,
                                                           self.player.far)
@@ -204,8 +208,9 @@ class GameWorld:
 
     # --- Update Loop ---
     def update(self, dt):
-        # 1. Chunks updaten
+        # 1. Chunks und Horizont updaten
         self.chunk_manager.update(self.player.pos)
+        self.horizon_manager.update(self.player.pos)
 
         # 2. Player Input & Physics
         if glfw.get_input_mode(self.window, glfw.CURSOR) == glfw.CURSOR_DISABLED:
@@ -262,7 +267,7 @@ class GameWorld:
 
                 # Block ID holen
                 block_id = self.chunk_manager.get_block(cx, cz, bx, by, bz)
-                hardness = BLOCK_HARDNESS.get(block_id, DEFAULT_HARDNESS)
+                hardness = BLOCK_HARDNESS[block_id]
 
                 if hardness > 0:
                     self.mining_progress += dt / hardness
@@ -306,18 +311,21 @@ class GameWorld:
             glBindTexture(GL_TEXTURE_2D, tex)
 
         # 1. Chunks rendern (delegiert an ChunkManager)
-        self.chunk_manager.render(self._is_chunk_visible, planes)
+        self.chunk_manager.render(self._is_chunk_visible, planes, self.chunk_offset_loc)
 
         # --- FIX FÜR Z-FIGHTING (Polygon Offset) ---
         glEnable(GL_POLYGON_OFFSET_FILL)
         # Feste Konstanten, um die Tiefe leicht zu verschieben
         glPolygonOffset(2.0, 2.0)  # Experimentieren Sie mit diesen Werten (z.B. 1.0, 1.0)
 
-        self.chunk_manager.render(self._is_chunk_visible, planes)
+        self.chunk_manager.render(self._is_chunk_visible, planes, self.chunk_offset_loc)
 
         glDisable(GL_POLYGON_OFFSET_FILL)
         # -------------------------------------------
 
+        # Horizont nach den Chunks (wo echtes Terrain liegt, gewinnt es im Tiefentest)
+        self.horizon_manager.render(view, self.projection)
+
         # 2. Mining Risse
         self._draw_cracks(view)
 
@@ -403,6 +411,7 @@ class GameWorld:
         return True
 
     def shutdown(self):
+        self.horizon_manager.shutdown()
         self.chunk_manager.shutdown()
 
 
@@ -423,7 +432,15 @@ def run_game(window, shader, width, height):
                 fps = frame_count / (now - last_fps_update)
                 # Chunks zählen via Manager
                 chunk_count = len(game_world.chunk_manager.chunk_data)
-                glfw.set_window_title(window, f"Minecraft Clone | FPS: {fps:.2f} | Chunks: {chunk_count}")
+                title = f"Minecraft Clone | FPS: {fps:.2f} | Chunks: {chunk_count}"
+                mesh_cache = game_world.chunk_manager.mesh_cache
+                if mesh_cache is not None:
+                    title += f" | Mesh-Cache: {mesh_cache.hit_rate:.0%}"
+                # Spalten-Cache dieses Prozesses (beim Prozess-Backend rechnen die Worker)
+                column_stats = COLUMN_CACHE.stats()
+                if column_stats['hits'] + column_stats['misses']:
+                    title += f" | Spalten-Cache: {column_stats['hit_rate']:.0%}"
+                glfw.set_window_title(window, title)
                 frame_count = 0
                 last_fps_update = now
 
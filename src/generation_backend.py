@@ -0,0 +1,247 @@
+# --- src/generation_backend.py ---
+import os
+import threading
+import concurrent.futures
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .chunk_data import BLOCK_DATA_SHAPE, BLOCK_DTYPE
+from .chunk_mesh import (
+    block_data_worker_wrapper, block_data_shm_worker,
+    region_worker_wrapper, region_shm_worker
+)
+
+BACKEND_THREAD = "thread"
+BACKEND_PROCESS = "process"
+
+
+def _region_coords(cx0, cz0, w, h):
+    return [(cx0 + i, cz0 + j) for i in range(w) for j in range(h)]
+
+
+def _fan_out(inner, coords, collect, cleanup=None):
+    """
+    Verteilt das Ergebnis eines Regions-Jobs auf ein Future pro Chunk.
+    collect(result) liefert {coord: block_data}; Fehler landen als Exception in allen Futures.
+    """
+    outers = {coord: concurrent.futures.Future() for coord in coords}
+
+    def _on_done(f):
+        try:
+            res = f.result()
+            if isinstance(res, Exception):
+                raise res
+            chunks = collect(res)
+            for coord, outer in outers.items():
+                outer.set_result(chunks[coord])
+        except Exception as e:
+            for outer in outers.values():
+                if not outer.done():
+                    outer.set_result(Exception(f"Fehler in Region-Job: {e}"))
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    inner.add_done_callback(_on_done)
+    return outers
+
+
+class ThreadGenerationBackend:
+    """Generiert Blockdaten im (geteilten) Thread-Pool des ChunkManagers."""
+
+    def __init__(self, executor, world_seed):
+        self.executor = executor
+        self.world_seed = world_seed
+
+    def submit(self, cx, cz):
+        return self.executor.submit(block_data_worker_wrapper, cx, cz, self.world_seed)
+
+    def submit_region(self, cx0, cz0, w, h):
+        """Ein Job für w x h Chunks, liefert {coord: Future}."""
+        inner = self.executor.submit(region_worker_wrapper, cx0, cz0, w, h, self.world_seed)
+        return _fan_out(inner, _region_coords(cx0, cz0, w, h), lambda chunks: chunks)
+
+    def release(self, future):
+        # Ergebnisse sind eigene Arrays, nichts freizugeben
+        pass
+
+    def shutdown(self):
+        # Der Thread-Pool gehört dem ChunkManager und wird dort beendet
+        pass
+
+
+class SharedSlabPool:
+    """
+    Wiederverwendbare Shared-Memory-Blöcke, höchstens max_slabs Stück (einer pro
+    Worker). Ist keiner frei, liefert acquire() None und der Aufrufer wartet.
+    """
+
+    def __init__(self, shape, dtype, max_slabs):
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.nbytes = int(np.prod(shape)) * self.dtype.itemsize
+        self.max_slabs = max_slabs
+
+        self._all = {}  # {name: SharedMemory}
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._free:
+                return self._all[self._free.pop()]
+            if len(self._all) >= self.max_slabs:
+                return None
+            shm = shared_memory.SharedMemory(create=True, size=self.nbytes)
+            self._all[shm.name] = shm
+            return shm
+
+    def release(self, shm):
+        with self._lock:
+            if shm.name in self._all:
+                self._free.append(shm.name)
+
+    def as_array(self, shm):
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    def close(self):
+        with self._lock:
+            for shm in self._all.values():
+                _close_shm(shm)
+            self._all.clear()
+            self._free.clear()
+
+
+def _close_shm(shm):
+    try:
+        shm.close()
+    except BufferError:
+        pass  # Es leben noch Sichten darauf; der Speicher verschwindet mit der letzten
+    shm.unlink()
+
+
+class _SlabJob:
+    """Ein Generierungs-Job: seine Futures und die Freigabe des Shared Memory, sobald alle abgeholt sind."""
+
+    __slots__ = ("pending", "done", "free")
+
+    def __init__(self, futures, free):
+        self.pending = set(futures)
+        self.done = False
+        self.free = free
+
+
+class ProcessGenerationBackend:
+    """
+    Generiert Blockdaten in einem Prozess-Pool. Die Worker schreiben direkt in
+    Shared-Memory-Slabs, zurück kommt nur ein kleines Statusobjekt statt eines
+    gepickelten Arrays.
+
+    submit() / submit_region() liefern Futures mit einer Sicht direkt auf den Slab
+    (keine Kopie). Der Verbraucher muss das Ergebnis nach dem Lesen mit release()
+    zurückgeben, auch verworfene Futures. Es gibt höchstens so viele Chunk-Slabs wie
+    Worker; weitere Jobs warten, bis einer frei wird.
+    """
+
+    def __init__(self, world_seed, max_workers=None):
+        self.world_seed = world_seed
+        workers = max_workers or os.cpu_count()
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        self.slabs = SharedSlabPool(BLOCK_DATA_SHAPE, BLOCK_DTYPE, workers)
+
+        self._lock = threading.RLock()
+        self._jobs = {}  # {Future: _SlabJob}
+        self._waiting = deque()  # (cx, cz, Future) ohne freien Slab
+
+    def submit(self, cx, cz):
+        outer = concurrent.futures.Future()
+        with self._lock:
+            self._waiting.append((cx, cz, outer))
+        self._start_waiting()
+        return outer
+
+    def _start_waiting(self):
+        with self._lock:
+            while self._waiting:
+                shm = self.slabs.acquire()
+                if shm is None:
+                    return
+                cx, cz, outer = self._waiting.popleft()
+                job = _SlabJob([outer], lambda shm=shm: self._release_slab(shm))
+                self._jobs[outer] = job
+                inner = self.executor.submit(block_data_shm_worker, cx, cz, shm.name, self.world_seed)
+                inner.add_done_callback(
+                    lambda f, shm=shm, job=job, outers={(cx, cz): outer}: self._finish(
+                        job, f, outers, lambda: {coord: self.slabs.as_array(shm) for coord in outers}))
+
+    def _release_slab(self, shm):
+        self.slabs.release(shm)
+        self._start_waiting()
+
+    def submit_region(self, cx0, cz0, w, h):
+        """Ein Job für w x h Chunks in einem eigenen Shared-Memory-Block, liefert {coord: Future}."""
+        shape = (w, h) + BLOCK_DATA_SHAPE
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(BLOCK_DTYPE).itemsize)
+        outers = {coord: concurrent.futures.Future() for coord in _region_coords(cx0, cz0, w, h)}
+        job = _SlabJob(outers.values(), lambda: _close_shm(shm))
+
+        def _collect():
+            region = np.ndarray(shape, dtype=BLOCK_DTYPE, buffer=shm.buf)
+            return {(cx0 + i, cz0 + j): region[i, j] for i in range(w) for j in range(h)}
+
+        with self._lock:
+            for outer in outers.values():
+                self._jobs[outer] = job
+            inner = self.executor.submit(region_shm_worker, cx0, cz0, w, h, shm.name, self.world_seed)
+            inner.add_done_callback(lambda f: self._finish(job, f, outers, _collect))
+        return outers
+
+    def _finish(self, job, inner, outers, collect):
+        """Läuft im Management-Thread des Pools: Sichten auf den Slab an die Futures verteilen."""
+        try:
+            res = inner.result()
+            if isinstance(res, Exception):
+                raise res
+            results = collect()
+        except Exception as e:
+            error = Exception(f"Fehler in Prozess-Worker: {e}")
+            results = {coord: error for coord in outers}
+
+        with self._lock:
+            job.done = True
+            for coord, outer in outers.items():
+                if outer in job.pending:
+                    outer.set_result(results[coord])
+            free = job.free if not job.pending else None
+        if free is not None:
+            free()  # Alle Futures schon verworfen
+
+    def release(self, future):
+        """Gibt das Ergebnis (die Slab-Sicht) eines Futures zurück; danach darf es nicht mehr gelesen werden."""
+        with self._lock:
+            job = self._jobs.pop(future, None)
+            if job is None:
+                # Wartet noch auf einen Slab -> einfach nicht starten
+                self._waiting = deque(w for w in self._waiting if w[2] is not future)
+                return
+            job.pending.discard(future)
+            free = job.free if job.done and not job.pending else None
+        if free is not None:
+            free()
+
+    def shutdown(self):
+        with self._lock:
+            self._waiting.clear()
+        self.executor.shutdown(wait=True)
+        self.slabs.close()
+
+
+def create_generation_backend(kind, thread_executor, world_seed, max_workers=None):
+    """Factory für den ChunkManager: 'thread' oder 'process'."""
+    if kind == BACKEND_PROCESS:
+        return ProcessGenerationBackend(world_seed, max_workers)
+    if kind == BACKEND_THREAD:
+        return ThreadGenerationBackend(thread_executor, world_seed)
+    raise ValueError(f"Unbekanntes Generierungs-Backend: {kind}")
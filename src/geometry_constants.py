@@ -55,3 +55,48 @@ CUBE_NORMALS = np.array([
     [0.0, 1.0, 0.0], [0.0, -1.0, 0.0], [-1.0, 0.0, 0.0],
     [1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.0, -1.0]
 ], dtype=np.float32)
+
+
+def _axes_for_faces():
+    """
+    Pro Face: (Normalen-Achse, Flächen-Achse A, Flächen-Achse B) und für U/V
+    die Welt-Achse, der die Texturkoordinate folgt, samt Richtung (+1: uv = Position,
+    -1: uv = 1 - Position). Damit kann der Greedy-Mesher Quads strecken und der
+    Shader die UVs aus der Position ableiten (Texturen nutzen GL_REPEAT).
+    """
+    face_axes = np.zeros((6, 3), dtype=np.int64)
+    uv_axes = np.zeros((6, 2), dtype=np.int64)
+    uv_signs = np.zeros((6, 2), dtype=np.int64)
+    for f in range(6):
+        n = int(np.flatnonzero(CUBE_NORMALS[f])[0])
+        a, b = [axis for axis in range(3) if axis != n]
+        face_axes[f] = (n, a, b)
+        for k in range(2):
+            uv = CUBE_UVS[f, :, k]
+            for axis in (a, b):
+                v = CUBE_VERTICES[f, :, axis]
+                if np.array_equal(uv, v):
+                    uv_axes[f, k], uv_signs[f, k] = axis, 1
+                elif np.array_equal(uv, 1.0 - v):
+                    uv_axes[f, k], uv_signs[f, k] = axis, -1
+    return face_axes, uv_axes, uv_signs
+
+
+FACE_AXES, CUBE_UV_AXES, CUBE_UV_SIGNS = _axes_for_faces()
+
+# --- Gepacktes Chunk-Vertex-Format: 2 x uint32 pro Vertex (8 statt 28 Bytes) ---
+# Wort 0: x (5 Bit) | z (5 Bit) | y (10 Bit) | Face (3 Bit), Position chunk-lokal (0..16 / 0..Höhe)
+# Wort 1: Textur-Index (8 Bit, 255 = keine Textur) | Licht (8 Bit, 0..255 entspricht 0..15)
+# Die Welt-Position kommt aus dem Uniform u_chunk_offset, die UVs aus Face + Position.
+VERTEX_WORDS = 2
+PACKED_X_SHIFT = 0
+PACKED_Z_SHIFT = 5
+PACKED_Y_SHIFT = 10
+PACKED_FACE_SHIFT = 20
+PACKED_XZ_MASK = 0x1F
+PACKED_Y_MASK = 0x3FF
+PACKED_FACE_MASK = 0x7
+PACKED_TEX_MASK = 0xFF
+PACKED_LIGHT_SHIFT = 8
+PACKED_LIGHT_MASK = 0xFF
+PACKED_LIGHT_SCALE = 255.0 / 15.0
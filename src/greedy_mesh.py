@@ -2,141 +2,331 @@
 import numpy as np
 from numba import jit
 
-from .chunk_data import CHUNK_SIZE, MAX_HEIGHT, ID_AIR
+from .chunk_data import CHUNK_SIZE, ID_AIR
+from .chunk_sections import SECTION_SIZE
 # WICHTIG: CACTUS_VERTICES NICHT MEHR NÖTIG
-from .geometry_constants import CUBE_VERTICES, CUBE_UVS, CUBE_NORMALS, FACE_SHADING
-from .block_definitions import (
-    ID_LEAVES, ID_OAK_LOG, ID_GRASS, ID_DIRT, ID_STONE, ID_SAND, ID_CACTUS, ID_WATER,
-    NON_SOLID_BLOCKS_NUMBA, OAK_LOG_TEXTURES, GRASS_TEXTURES, CACTUS_TEXTURES,
-    TEX_INDEX_LEAVES, TEX_INDEX_DIRT, TEX_INDEX_STONE, TEX_INDEX_SAND, WATER_TEXTURES
+from .geometry_constants import (
+    CUBE_VERTICES, CUBE_NORMALS, FACE_SHADING, FACE_AXES, VERTEX_WORDS,
+    PACKED_X_SHIFT, PACKED_Y_SHIFT, PACKED_Z_SHIFT, PACKED_FACE_SHIFT,
+    PACKED_TEX_MASK, PACKED_LIGHT_SHIFT, PACKED_LIGHT_MASK, PACKED_LIGHT_SCALE
 )
-from .lighting_system import calculate_minecraft_vertex_light
-
-@jit(nopython=True, cache=True)
-def is_nonsolid(block_id, nonsolid_array):
-    for nonsolid_id in nonsolid_array:
-        if block_id == nonsolid_id:
-            return True
-    return False
-
-@jit(nopython=True, cache=True)
-def generate_face_culling_mesh_v7(cx, cz, block_data, light_map):
-    MAX_FACES = CHUNK_SIZE * CHUNK_SIZE * MAX_HEIGHT * 6
-    MAX_VERTS = MAX_FACES * 4 * 7
-    vertices = np.empty(MAX_VERTS, dtype=np.float32)
-    indices = np.empty(MAX_FACES * 6, dtype=np.uint32)
+from .lighting_system import calculate_face_light
+
+def max_mesh_faces(height):
+    """Obergrenze an Flächen pro Chunk (jede Blockseite sichtbar) für die Puffergröße."""
+    return CHUNK_SIZE * CHUNK_SIZE * height * 6
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _pack_vertex(vertices, offset, lx, ly, lz, i_face, texture_index, light):
+    """Schreibt einen Vertex im gepackten Format (siehe geometry_constants) ab vertices[offset]."""
+    # Erst auf float32 runden wie im Licht-Array des Greedy-Meshers, damit beide Mesher gleich quantisieren
+    quantized = int(np.float32(light) * PACKED_LIGHT_SCALE + 0.5)
+    if quantized > PACKED_LIGHT_MASK:
+        quantized = PACKED_LIGHT_MASK
+    vertices[offset] = ((lx << PACKED_X_SHIFT) | (lz << PACKED_Z_SHIFT)
+                        | (ly << PACKED_Y_SHIFT) | (i_face << PACKED_FACE_SHIFT))
+    vertices[offset + 1] = (int(texture_index) & PACKED_TEX_MASK) | (quantized << PACKED_LIGHT_SHIFT)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _emit_face(block_data, light_map, corner_light, face_textures, light_attenuation,
+               block_id, x, y, z, i_face, face_light, vertices, vert_count, indices, index_count):
+    """Schreibt eine einzelne Blockfläche ab vertices[vert_count] bzw. indices[index_count]."""
+    texture_index = face_textures[block_id, i_face]
+    calculate_face_light(light_map, block_data, corner_light, x, y, z, i_face,
+                         light_attenuation, face_light)
+
+    lx = x - 1
+    lz = z - 1
+    start_vert_idx = vert_count
+    for i_vert in range(4):
+        # WICHTIG: Immer CUBE_VERTICES verwenden!
+        vx = int(CUBE_VERTICES[i_face, i_vert, 0])
+        vy = int(CUBE_VERTICES[i_face, i_vert, 1])
+        vz = int(CUBE_VERTICES[i_face, i_vert, 2])
+
+        combined_light = face_light[i_vert] * FACE_SHADING[i_face]
+
+        _pack_vertex(vertices, start_vert_idx, lx + vx, y + vy, lz + vz,
+                     i_face, texture_index, combined_light)
+        start_vert_idx += VERTEX_WORDS
+
+    index_offset = vert_count // VERTEX_WORDS
+    indices[index_count] = index_offset
+    indices[index_count + 1] = index_offset + 1
+    indices[index_count + 2] = index_offset + 2
+    indices[index_count + 3] = index_offset + 2
+    indices[index_count + 4] = index_offset + 3
+    indices[index_count + 5] = index_offset
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def generate_face_culling_mesh_v7(block_data, light_map, corner_light,
+                                  face_textures, face_visible, light_attenuation, section_mask,
+                                  vertices, indices):
+    """
+    face_textures, face_visible, light_attenuation: Tabellen aus der BlockRegistry
+    (als Argument, damit der Numba-Cache neue Blöcke nicht verschluckt).
+    section_mask: bool pro 16er-Section, False = überspringen (siehe section_mesh_mask).
+    corner_light: vorberechnetes Eck-Licht oder leeres Array (siehe calculate_face_light).
+    vertices, indices: Ausgabe-Puffer für max_mesh_faces(...) Flächen (werden
+    wiederverwendet, siehe MeshScratch). Rückgabe: Anzahl geschriebener Flächen.
+
+    Vertices sind gepackt (VERTEX_WORDS uint32, chunk-lokale Position), die
+    Welt-Position setzt der Shader über u_chunk_offset.
+    """
+    dx, dy, dz = block_data.shape
+
+    face_count = 0
+    face_light = np.empty(4, dtype=np.float64)
+
+    for section in range(section_mask.shape[0]):
+        if not section_mask[section]:
+            continue
+        y0 = section * SECTION_SIZE
+
+        for x in range(1, dx - 1):
+            for z in range(1, dz - 1):
+                for y in range(y0, y0 + SECTION_SIZE):
+                    block_id = block_data[x, y, z]
+
+                    if block_id == ID_AIR:
+                        continue
+
+                    for i_face in range(6):
+                        nx, ny, nz = CUBE_NORMALS[i_face]
+                        neighbor_x = x + int(nx)
+                        neighbor_y = y + int(ny)
+                        neighbor_z = z + int(nz)
+
+                        is_face_visible = False
+
+                        if neighbor_y < 0 or neighbor_y >= dy:
+                            is_face_visible = True
+                        elif 0 <= neighbor_x < dx and 0 <= neighbor_z < dz:
+                            neighbor_id = block_data[neighbor_x, neighbor_y, neighbor_z]
+                            is_face_visible = face_visible[block_id, neighbor_id]
+
+                        if is_face_visible:
+                            _emit_face(block_data, light_map, corner_light, face_textures, light_attenuation,
+                                       block_id, x, y, z, i_face, face_light,
+                                       vertices, face_count * 4 * VERTEX_WORDS, indices, face_count * 6)
+                            face_count += 1
+
+    return face_count
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def generate_masked_faces(block_data, light_map, corner_light,
+                          face_textures, face_visible, light_attenuation, face_mask, y0,
+                          vertices, indices):
+    """
+    Einzelne Blockflächen wie generate_face_culling_mesh_v7, aber nur für die
+    in face_mask (6, CHUNK_SIZE, ny, CHUNK_SIZE) markierten Flächen der Blöcke
+    ab Höhe y0. Grundlage für das In-Place-Patchen nach Block-Änderungen
+    (siehe section_mesh). Rückgabe: Anzahl geschriebener Flächen.
+    """
+    dy = block_data.shape[1]
+    face_count = 0
+    face_light = np.empty(4, dtype=np.float64)
+
+    for i_face in range(6):
+        nx = int(CUBE_NORMALS[i_face, 0])
+        ny = int(CUBE_NORMALS[i_face, 1])
+        nz = int(CUBE_NORMALS[i_face, 2])
+        for lx in range(face_mask.shape[1]):
+            for lz in range(face_mask.shape[3]):
+                for ly in range(face_mask.shape[2]):
+                    if not face_mask[i_face, lx, ly, lz]:
+                        continue
+                    x = lx + 1
+                    y = y0 + ly
+                    z = lz + 1
+                    block_id = block_data[x, y, z]
+                    if block_id == ID_AIR:
+                        continue
+                    neighbor_y = y + ny
+                    if neighbor_y < 0 or neighbor_y >= dy:
+                        is_face_visible = True
+                    else:
+                        is_face_visible = face_visible[block_id, block_data[x + nx, neighbor_y, z + nz]]
+                    if is_face_visible:
+                        _emit_face(block_data, light_map, corner_light, face_textures, light_attenuation,
+                                   block_id, x, y, z, i_face, face_light,
+                                   vertices, face_count * 4 * VERTEX_WORDS, indices, face_count * 6)
+                        face_count += 1
+
+    return face_count
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _collect_face_layer(block_data, light_map, corner_light, face_textures, face_visible, light_attenuation,
+                        section_mask, i_face, visible, tex, light, uniform):
+    """
+    Füllt für eine Face-Richtung pro Voxel (ungepaddete Koordinaten):
+    visible, Textur, die 4 Vertex-Lichtwerte und ob alle 4 gleich sind.
+    """
+    dx, dy, dz = block_data.shape
+    nx = int(CUBE_NORMALS[i_face, 0])
+    ny = int(CUBE_NORMALS[i_face, 1])
+    nz = int(CUBE_NORMALS[i_face, 2])
+    face_light = np.empty(4, dtype=np.float64)
+
+    visible[:] = False
+    for section in range(section_mask.shape[0]):
+        if not section_mask[section]:
+            continue
+        y0 = section * SECTION_SIZE
+
+        for x in range(1, dx - 1):
+            for z in range(1, dz - 1):
+                for y in range(y0, y0 + SECTION_SIZE):
+                    block_id = block_data[x, y, z]
+                    if block_id == ID_AIR:
+                        continue
+
+                    neighbor_y = y + ny
+                    if neighbor_y < 0 or neighbor_y >= dy:
+                        is_face_visible = True
+                    else:
+                        is_face_visible = face_visible[block_id, block_data[x + nx, neighbor_y, z + nz]]
+                    if not is_face_visible:
+                        continue
+
+                    lx = x - 1
+                    lz = z - 1
+                    visible[lx, y, lz] = True
+                    tex[lx, y, lz] = face_textures[block_id, i_face]
+
+                    calculate_face_light(light_map, block_data, corner_light, x, y, z, i_face,
+                                         light_attenuation, face_light)
+                    same = True
+                    for i_vert in range(4):
+                        value = face_light[i_vert] * FACE_SHADING[i_face]
+                        light[lx, y, lz, i_vert] = value
+                        if value != light[lx, y, lz, 0]:
+                            same = False
+                    uniform[lx, y, lz] = same
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def generate_greedy_mesh(block_data, light_map, corner_light,
+                         face_textures, face_visible, light_attenuation, section_mask,
+                         vertices, indices, visible, done, uniform, tex, light):
+    """
+    Greedy Meshing: gleiche Eingaben und gleiches Vertex-Format wie
+    generate_face_culling_mesh_v7, aber benachbarte koplanare Flächen mit
+    gleicher Textur und gleichem Licht werden zu Rechtecken zusammengefasst.
+
+    Zusammengefasst werden nur Flächen, deren 4 Vertex-Lichtwerte gleich sind
+    (dann sieht das große Quad exakt aus wie die Einzelflächen). Flächen mit
+    AO-Verlauf bleiben einzeln. Der Shader leitet die UVs aus der Position ab,
+    die Textur wird so per GL_REPEAT über das Quad gekachelt.
+
+    visible, done, uniform, tex, light: Arbeits-Arrays der Größe
+    (CHUNK_SIZE, Höhe, CHUNK_SIZE[, 4]), ebenfalls aus dem MeshScratch.
+    """
+    dx, dy, dz = block_data.shape
+    sx = dx - 2
+    sz = dz - 2
+
+    # Nur den Y-Bereich der gewünschten Sections durchlaufen (z.B. eine einzelne Section)
+    y_lo = dy
+    y_hi = 0
+    for section in range(section_mask.shape[0]):
+        if section_mask[section]:
+            y_lo = min(y_lo, section * SECTION_SIZE)
+            y_hi = max(y_hi, (section + 1) * SECTION_SIZE)
+    lo = np.array([0, y_lo, 0], dtype=np.int64)
+    hi = np.array([sx, y_hi, sz], dtype=np.int64)
 
     vert_count = 0
     index_count = 0
     index_offset = 0
 
-    base_x = cx * CHUNK_SIZE
-    base_z = cz * CHUNK_SIZE
+    pos = np.zeros(3, dtype=np.int64)
+    ext = np.ones(3, dtype=np.int64)
 
-    dx, dy, dz = block_data.shape
+    for i_face in range(6):
+        _collect_face_layer(block_data, light_map, corner_light, face_textures, face_visible, light_attenuation,
+                            section_mask, i_face, visible, tex, light, uniform)
+        done[:] = False
 
-    for x in range(1, dx - 1):
-        for z in range(1, dz - 1):
-            for y in range(dy):
-                block_id = block_data[x, y, z]
+        n = FACE_AXES[i_face, 0]
+        a = FACE_AXES[i_face, 1]
+        b = FACE_AXES[i_face, 2]
 
-                if block_id == ID_AIR:
-                    continue
+        for s in range(lo[n], hi[n]):
+            for i in range(lo[a], hi[a]):
+                for j in range(lo[b], hi[b]):
+                    pos[n] = s
+                    pos[a] = i
+                    pos[b] = j
+                    x0, y0, z0 = pos[0], pos[1], pos[2]
+                    if not visible[x0, y0, z0] or done[x0, y0, z0]:
+                        continue
 
-                is_current_leaves = (block_id == ID_LEAVES)
-                is_current_water = (block_id == ID_WATER)  # <--- Check
-                # Kaktus ist jetzt ein ganz normaler Block, keine Sonderbehandlung mehr hier!
+                    w = 1  # Ausdehnung entlang b
+                    h = 1  # Ausdehnung entlang a
+                    if uniform[x0, y0, z0]:
+                        t = tex[x0, y0, z0]
+                        l = light[x0, y0, z0, 0]
 
-                wx = base_x + x - 1
-                wz = base_z + z - 1
+                        # 1. So weit wie möglich entlang b wachsen
+                        while j + w < hi[b]:
+                            pos[b] = j + w
+                            px, py, pz = pos[0], pos[1], pos[2]
+                            if (not visible[px, py, pz] or done[px, py, pz] or not uniform[px, py, pz]
+                                    or tex[px, py, pz] != t or light[px, py, pz, 0] != l):
+                                break
+                            w += 1
 
-                for i_face in range(6):
-                    nx, ny, nz = CUBE_NORMALS[i_face]
-                    neighbor_x = x + int(nx)
-                    neighbor_y = y + int(ny)
-                    neighbor_z = z + int(nz)
+                        # 2. Ganze Zeilen entlang a anhängen, solange sie komplett passen
+                        grow = True
+                        while grow and i + h < hi[a]:
+                            pos[a] = i + h
+                            for k in range(w):
+                                pos[b] = j + k
+                                px, py, pz = pos[0], pos[1], pos[2]
+                                if (not visible[px, py, pz] or done[px, py, pz] or not uniform[px, py, pz]
+                                        or tex[px, py, pz] != t or light[px, py, pz, 0] != l):
+                                    grow = False
+                                    break
+                            if grow:
+                                h += 1
 
-                    is_face_visible = False
+                    # Abgedeckte Flächen markieren
+                    pos[n] = s
+                    for di in range(h):
+                        pos[a] = i + di
+                        for dj in range(w):
+                            pos[b] = j + dj
+                            done[pos[0], pos[1], pos[2]] = True
 
-                    if neighbor_y < 0 or neighbor_y >= MAX_HEIGHT:
-                        is_face_visible = True
-                    elif 0 <= neighbor_x < dx and 0 <= neighbor_z < dz:
-                        neighbor_id = block_data[neighbor_x, neighbor_y, neighbor_z]
-
-                        # SPEZIALFALL WASSER
-                        if is_current_water:
-                            if neighbor_id != ID_WATER:
-                                is_face_visible = True
-
-                        elif is_current_leaves:
-                            if neighbor_id == ID_AIR or neighbor_id == ID_LEAVES:
-                                is_face_visible = True
-                        else:
-                            # DIESER FALL BEHANDELT SAND, ERDE, STEIN
-                            is_neighbor_nonsolid = is_nonsolid(neighbor_id, NON_SOLID_BLOCKS_NUMBA)
-                            if is_neighbor_nonsolid:
-                                is_face_visible = True
+                    # Quad ausgeben
+                    ext[n] = 1
+                    ext[a] = h
+                    ext[b] = w
+                    texture_index = tex[x0, y0, z0]
+                    start_vert_idx = vert_count
+                    for i_vert in range(4):
+                        _pack_vertex(vertices, start_vert_idx,
+                                     x0 + int(CUBE_VERTICES[i_face, i_vert, 0]) * ext[0],
+                                     y0 + int(CUBE_VERTICES[i_face, i_vert, 1]) * ext[1],
+                                     z0 + int(CUBE_VERTICES[i_face, i_vert, 2]) * ext[2],
+                                     i_face, texture_index, light[x0, y0, z0, i_vert])
+                        start_vert_idx += VERTEX_WORDS
 
-                    if is_face_visible:
-                        start_vert_idx = vert_count
-                        texture_index = -1.0
-
-                        # --- TEXTUR ZUWEISUNG ---
-                        if block_id == ID_GRASS:
-                            texture_index = GRASS_TEXTURES[i_face]
-                        elif block_id == ID_OAK_LOG:
-                            texture_index = OAK_LOG_TEXTURES[i_face]
-                        elif block_id == ID_LEAVES:
-                            texture_index = TEX_INDEX_LEAVES
-                        elif block_id == ID_DIRT:
-                            texture_index = TEX_INDEX_DIRT
-                        elif block_id == ID_STONE:
-                            texture_index = TEX_INDEX_STONE
-                        elif block_id == ID_SAND:
-                            texture_index = TEX_INDEX_SAND
-                        elif block_id == ID_CACTUS:
-                            texture_index = CACTUS_TEXTURES[i_face]
-                        elif block_id == ID_WATER:  # <--- NEU
-                            texture_index = WATER_TEXTURES[i_face]
-
-                        # Vertex Generation
-                        for i_vert in range(4):
-                            # WICHTIG: Immer CUBE_VERTICES verwenden!
-                            vx = CUBE_VERTICES[i_face, i_vert, 0]
-                            vy = CUBE_VERTICES[i_face, i_vert, 1]
-                            vz = CUBE_VERTICES[i_face, i_vert, 2]
-
-                            uv_u = CUBE_UVS[i_face, i_vert, 0]
-                            uv_v = CUBE_UVS[i_face, i_vert, 1]
-
-                            sunlight = calculate_minecraft_vertex_light(
-                                light_map, block_data, x, y, z, i_face, i_vert, 0
-                            )
-                            blocklight = calculate_minecraft_vertex_light(
-                                light_map, block_data, x, y, z, i_face, i_vert, 1
-                            )
-
-                            combined_light = max(sunlight, blocklight) * FACE_SHADING[i_face]
-
-                            vertices[start_vert_idx] = wx + vx
-                            vertices[start_vert_idx + 1] = y + vy
-                            vertices[start_vert_idx + 2] = wz + vz
-                            vertices[start_vert_idx + 3] = uv_u
-                            vertices[start_vert_idx + 4] = uv_v
-                            vertices[start_vert_idx + 5] = texture_index
-                            vertices[start_vert_idx + 6] = combined_light
-
-                            start_vert_idx += 7
-
-                        vert_count += 28
-                        indices[index_count] = index_offset
-                        indices[index_count + 1] = index_offset + 1
-                        indices[index_count + 2] = index_offset + 2
-                        indices[index_count + 3] = index_offset + 2
-                        indices[index_count + 4] = index_offset + 3
-                        indices[index_count + 5] = index_offset
-
-                        index_count += 6
-                        index_offset += 4
-
-    return (vertices[:vert_count].reshape(-1, 7), indices[:index_count])
\ No newline at end of file
+                    vert_count += 4 * VERTEX_WORDS
+                    indices[index_count] = index_offset
+                    indices[index_count + 1] = index_offset + 1
+                    indices[index_count + 2] = index_offset + 2
+                    indices[index_count + 3] = index_offset + 2
+                    indices[index_count + 4] = index_offset + 3
+                    indices[index_count + 5] = index_offset
+
+                    index_count += 6
+                    index_offset += 4
+
+    return index_count // 6
@@ -1,13 +1,7 @@
 # --- src/hotbar.py ---
 import numpy as np
 from OpenGL.GL import *
-from src.block_definitions import (
-    ID_AIR, ID_GRASS, ID_DIRT, ID_STONE, ID_OAK_LOG,
-    ID_LEAVES, ID_SAND, ID_CACTUS,
-    GRASS_TEXTURES, OAK_LOG_TEXTURES, CACTUS_TEXTURES,
-    TEX_INDEX_DIRT, TEX_INDEX_STONE, TEX_INDEX_SAND, TEX_INDEX_LEAVES,
-    TEX_INDEX_HOTBAR
-)
+from src.block_definitions import ID_AIR, BLOCK_FACE_TEXTURES, TEX_INDEX_HOTBAR
 from src.text_generator import create_number_texture
 
 
@@ -86,21 +80,8 @@ class Hotbar:
             self.selected_slot_index = index
 
     def _get_texture_for_block(self, block_id):
-        tex_index = 0
-        if block_id == ID_GRASS:
-            tex_index = int(GRASS_TEXTURES[2])
-        elif block_id == ID_DIRT:
-            tex_index = int(TEX_INDEX_DIRT)
-        elif block_id == ID_STONE:
-            tex_index = int(TEX_INDEX_STONE)
-        elif block_id == ID_SAND:
-            tex_index = int(TEX_INDEX_SAND)
-        elif block_id == ID_OAK_LOG:
-            tex_index = int(OAK_LOG_TEXTURES[2])
-        elif block_id == ID_LEAVES:
-            tex_index = int(TEX_INDEX_LEAVES)
-        elif block_id == ID_CACTUS:
-            tex_index = int(CACTUS_TEXTURES[2])
+        # Seitentextur (Face 2) als Icon
+        tex_index = int(BLOCK_FACE_TEXTURES[block_id, 2])
 
         if 0 <= tex_index < len(self.textures):
             return self.textures[tex_index]
@@ -0,0 +1,82 @@
+# --- src/horizon.py ---
+import numpy as np
+
+from .chunk_data import CHUNK_SIZE, WorldSeed, compute_column_maps, surface_blocks
+from .geometry_constants import FACE_SHADING
+
+# Kachelgröße (in Chunks) und Abstand der Stützpunkte (in Blöcken) der Horizont-Kacheln
+HORIZON_TILE_CHUNKS = 4
+HORIZON_CELL_BLOCKS = 4
+HORIZON_TILE_CELLS = HORIZON_TILE_CHUNKS * CHUNK_SIZE // HORIZON_CELL_BLOCKS
+# Pro Vertex: x, y, z, Block-ID der Oberfläche, Schattierung
+HORIZON_VERTEX_FLOATS = 5
+# Der Horizont liegt etwas tiefer als das echte Terrain, damit er es nie überdeckt
+HORIZON_SINK_BLOCKS = 1.0
+
+
+def horizon_grid_indices(cells=HORIZON_TILE_CELLS):
+    """Dreiecks-Indizes für ein Gitter aus cells x cells Zellen, gleich für alle Kacheln (ein EBO)."""
+    row = cells + 1
+    x, z = np.meshgrid(np.arange(cells, dtype=np.uint32), np.arange(cells, dtype=np.uint32), indexing="ij")
+    v00 = (x * row + z).ravel()
+    v10 = v00 + row
+    v01 = v00 + 1
+    v11 = v10 + 1
+    return np.stack([v00, v01, v11, v11, v10, v00], axis=1).ravel()
+
+
+def horizon_tile_chunks(tile):
+    """Chunk-Bereich [cx0, cx1) x [cz0, cz1) einer Kachel."""
+    tx, tz = tile
+    return (tx * HORIZON_TILE_CHUNKS, (tx + 1) * HORIZON_TILE_CHUNKS,
+            tz * HORIZON_TILE_CHUNKS, (tz + 1) * HORIZON_TILE_CHUNKS)
+
+
+def build_horizon_tile(tx, tz, world_seed=None):
+    """
+    Höhenfeld einer Horizont-Kachel (HORIZON_TILE_CHUNKS² Chunks) nur aus der
+    2D-Höhen- und Biom-Noise (compute_column_maps, surface_blocks): keine
+    Blockdaten, kein Licht, kein Meshen. Ein Stützpunkt alle HORIZON_CELL_BLOCKS
+    Blöcke, der Rand wird mit abgetastet, damit Nachbarkacheln nahtlos anschließen.
+
+    Rückgabe: float32-Vertices (Welt-Koordinaten, siehe HORIZON_VERTEX_FLOATS),
+    Indizes liefert horizon_grid_indices. Die Farbe kommt im Shader aus der
+    Block-ID, geschattet wird nach der Steigung (flach wie Oberseiten, steil
+    wie Seitenflächen der Chunks).
+    """
+    if world_seed is None:
+        world_seed = WorldSeed()
+    size = HORIZON_TILE_CELLS + 1
+    step = HORIZON_CELL_BLOCKS
+
+    # Noise im verschobenen Raum des Seeds, Geometrie in Welt-Koordinaten
+    ncx, ncz = world_seed.noise_chunk(tx * HORIZON_TILE_CHUNKS, tz * HORIZON_TILE_CHUNKS)
+    heightmap, desert_mask = compute_column_maps(ncx * CHUNK_SIZE, ncz * CHUNK_SIZE, size, size, step=step)
+    top, block_ids = surface_blocks(heightmap, desert_mask)
+    top = top.astype(np.float32)
+
+    grad_x, grad_z = np.gradient(top, step)
+    flatness = 1.0 / np.sqrt(1.0 + grad_x * grad_x + grad_z * grad_z)
+    shade = FACE_SHADING[2] + (FACE_SHADING[0] - FACE_SHADING[2]) * flatness
+
+    # Stützpunkte in Spaltenmitte, wie die Oberseite des Blocks
+    base_x = tx * HORIZON_TILE_CHUNKS * CHUNK_SIZE + 0.5
+    base_z = tz * HORIZON_TILE_CHUNKS * CHUNK_SIZE + 0.5
+    xs = base_x + np.arange(size, dtype=np.float32) * step
+    zs = base_z + np.arange(size, dtype=np.float32) * step
+
+    vertices = np.empty((size, size, HORIZON_VERTEX_FLOATS), dtype=np.float32)
+    vertices[..., 0] = xs[:, None]
+    vertices[..., 1] = top - HORIZON_SINK_BLOCKS
+    vertices[..., 2] = zs[None, :]
+    vertices[..., 3] = block_ids
+    vertices[..., 4] = shade
+    return vertices.reshape(-1, HORIZON_VERTEX_FLOATS)
+
+
+def horizon_tile_worker(tx, tz, world_seed=None):
+    """Wrapper für den Thread-Pool."""
+    try:
+        return build_horizon_tile(tx, tz, world_seed)
+    except Exception as e:
+        return Exception(f"Fehler in Horizont-Worker für ({tx},{tz}): {e}")
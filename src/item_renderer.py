@@ -10,11 +10,7 @@ import OpenGL.GL.shaders
 from pyrr import Matrix44
 import math
 
-from src.block_definitions import (
-    ID_GRASS, ID_DIRT, ID_STONE, ID_OAK_LOG, ID_LEAVES, ID_SAND, ID_CACTUS,
-    GRASS_TEXTURES, OAK_LOG_TEXTURES, CACTUS_TEXTURES,
-    TEX_INDEX_DIRT, TEX_INDEX_STONE, TEX_INDEX_SAND, TEX_INDEX_LEAVES
-)
+from src.block_definitions import BLOCKS, BLOCK_FACE_TEXTURES
 from src.geometry_constants import CUBE_UVS # <--- DIESE ZEILE HINZUFÜGEN
 
 # --- SHADER (Unverändert) ---
@@ -131,25 +127,12 @@ class ItemRenderer:
         # WICHTIG: Casting zu int für sicheren Vergleich
         bid = int(round(block_id))
 
-        # Hier prüfen wir alle IDs
-        if bid == int(ID_GRASS):
-            return GRASS_TEXTURES.copy()
-        elif bid == int(ID_DIRT):
-            return np.array([TEX_INDEX_DIRT] * 6, dtype=np.float32)
-        elif bid == int(ID_STONE):
-            return np.array([TEX_INDEX_STONE] * 6, dtype=np.float32)
-        elif bid == int(ID_OAK_LOG):
-            return OAK_LOG_TEXTURES.copy()
-        elif bid == int(ID_LEAVES):
-            return np.array([TEX_INDEX_LEAVES] * 6, dtype=np.float32)
-        elif bid == int(ID_SAND):
-            return np.array([TEX_INDEX_SAND] * 6, dtype=np.float32)
-        elif bid == int(ID_CACTUS):
-            return CACTUS_TEXTURES.copy()
+        if 0 <= bid < len(BLOCK_FACE_TEXTURES) and bid in BLOCKS:
+            return BLOCK_FACE_TEXTURES[bid].copy()
         else:
             # Unbekannte ID -> Debug Print erzwingen
             if bid not in self.debugged_ids:
-                print(f"⚠️ WARNUNG: Keine Textur für Block-ID {bid} (Float: {block_id}) gefunden! Nutze Fallback.")
+                print(f"⚠️ WARNUNG: Keine Textur für Block-ID {bid} gefunden! Nutze Fallback.")
                 self.debugged_ids.add(bid)
             return np.array([-1.0] * 6, dtype=np.float32)  # Magenta
 
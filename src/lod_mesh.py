@@ -0,0 +1,141 @@
+# --- src/lod_mesh.py ---
+from numba import jit
+
+from .chunk_data import ID_AIR
+from .geometry_constants import CUBE_VERTICES, CUBE_NORMALS, FACE_SHADING, VERTEX_WORDS
+from .lighting_system import MAX_LIGHT_LEVEL
+from .greedy_mesh import _pack_vertex
+
+# Vergröberung pro LOD-Stufe (Stufe 0 = volle Auflösung, normale Mesher)
+LOD_FACTORS = (1, 2, 4)
+# Höhe (in Blöcken) der Schürzen an den Chunk-Rändern von LOD-Meshes: deckt Risse,
+# wo der Nachbar in einer anderen Stufe eine bis zu so viel höhere/tiefere Oberfläche hat
+LOD_SKIRT_BLOCKS = 4
+
+
+def lod_cells_shape(padded_shape, factor):
+    """Shape der vergröberten Zellen für ein um factor gepaddetes Array (1 Zelle Rand)."""
+    return (padded_shape[0] // factor, padded_shape[1] // factor, padded_shape[2] // factor)
+
+
+def lod_skirt_cells(factor):
+    return -(-LOD_SKIRT_BLOCKS // factor)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def downsample_blocks(block_data, factor, out):
+    """
+    Vergröbert um factor gepaddete Blockdaten auf Zellen aus factor³ Blöcken.
+
+    Eine Zelle ist gefüllt, wenn mindestens die Hälfte ihrer Blöcke keine Luft
+    ist. Stellvertreter ist der oberste Nicht-Luft-Block der Zelle, damit die
+    Oberfläche von weitem ihre Farbe behält (Gras bleibt Gras, nicht Erde).
+    """
+    cells_x, cells_y, cells_z = out.shape
+    volume = factor * factor * factor
+    for cx in range(cells_x):
+        for cz in range(cells_z):
+            for cy in range(cells_y):
+                count = 0
+                top_y = -1
+                top_id = ID_AIR
+                for x in range(cx * factor, (cx + 1) * factor):
+                    for z in range(cz * factor, (cz + 1) * factor):
+                        for y in range(cy * factor, (cy + 1) * factor):
+                            block_id = block_data[x, y, z]
+                            if block_id != ID_AIR:
+                                count += 1
+                                if y > top_y:
+                                    top_y = y
+                                    top_id = block_id
+                out[cx, cy, cz] = top_id if 2 * count >= volume else ID_AIR
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def downsample_light(light_map, factor, out):
+    """Vergröbert eine gepaddete Lichtkarte: Maximum pro Zelle und Kanal."""
+    cells_x, cells_y, cells_z, channels = out.shape
+    for cx in range(cells_x):
+        for cz in range(cells_z):
+            for cy in range(cells_y):
+                for c in range(channels):
+                    value = 0
+                    for x in range(cx * factor, (cx + 1) * factor):
+                        for z in range(cz * factor, (cz + 1) * factor):
+                            for y in range(cy * factor, (cy + 1) * factor):
+                                value = max(value, light_map[x, y, z, c])
+                    out[cx, cy, cz, c] = value
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def generate_lod_mesh(cells, cell_light, factor, face_textures, face_visible, opaque, skirt_cells,
+                      vertices, indices):
+    """
+    Face-Culling-Mesh auf vergröberten Zellen (downsample_blocks/-_light, 1 Zelle
+    Rand aus den Nachbarn): ein Quad pro sichtbarer Zellen-Fläche, factor Blöcke
+    groß, gleiches gepacktes Vertex-Format wie die anderen Mesher (die Textur
+    wiederholt sich per Position factor-mal). Licht pro Fläche aus der Zelle
+    davor, ohne AO.
+
+    Nahtstellen: Seitenflächen am Chunk-Rand werden auch gegen einen gefüllten
+    Nachbarn erzeugt, solange eine der skirt_cells Zellen darüber offen ist
+    (Schürze). Zwei Nachbarn derselben Stufe sehen am Rand dieselben Zellen;
+    ist der Nachbar feiner oder gröber gemesht, schließen die Schürzen die
+    Stufe zwischen den Oberflächen. Rückgabe: Anzahl geschriebener Flächen.
+    """
+    dx, dy, dz = cells.shape
+    face_count = 0
+
+    for x in range(1, dx - 1):
+        for z in range(1, dz - 1):
+            for y in range(dy):
+                block_id = cells[x, y, z]
+                if block_id == ID_AIR:
+                    continue
+
+                for i_face in range(6):
+                    nx, ny, nz = CUBE_NORMALS[i_face]
+                    neighbor_x = x + int(nx)
+                    neighbor_y = y + int(ny)
+                    neighbor_z = z + int(nz)
+
+                    if neighbor_y < 0 or neighbor_y >= dy:
+                        is_face_visible = True
+                        light = float(MAX_LIGHT_LEVEL)
+                    else:
+                        is_face_visible = face_visible[block_id, cells[neighbor_x, neighbor_y, neighbor_z]]
+                        if (not is_face_visible and int(ny) == 0
+                                and (neighbor_x == 0 or neighbor_x == dx - 1
+                                     or neighbor_z == 0 or neighbor_z == dz - 1)):
+                            for k in range(1, skirt_cells + 1):
+                                if y + k >= dy or not opaque[cells[x, y + k, z]]:
+                                    is_face_visible = True
+                                    break
+                        light = float(max(cell_light[neighbor_x, neighbor_y, neighbor_z, 0],
+                                          cell_light[neighbor_x, neighbor_y, neighbor_z, 1]))
+
+                    if not is_face_visible:
+                        continue
+
+                    texture_index = face_textures[block_id, i_face]
+                    combined_light = light * FACE_SHADING[i_face]
+                    start_vert_idx = face_count * 4 * VERTEX_WORDS
+                    for i_vert in range(4):
+                        _pack_vertex(vertices, start_vert_idx,
+                                     (x - 1 + int(CUBE_VERTICES[i_face, i_vert, 0])) * factor,
+                                     (y + int(CUBE_VERTICES[i_face, i_vert, 1])) * factor,
+                                     (z - 1 + int(CUBE_VERTICES[i_face, i_vert, 2])) * factor,
+                                     i_face, texture_index, combined_light)
+                        start_vert_idx += VERTEX_WORDS
+
+                    index_offset = face_count * 4
+                    index_count = face_count * 6
+                    indices[index_count] = index_offset
+                    indices[index_count + 1] = index_offset + 1
+                    indices[index_count + 2] = index_offset + 2
+                    indices[index_count + 3] = index_offset + 2
+                    indices[index_count + 4] = index_offset + 3
+                    indices[index_count + 5] = index_offset
+                    face_count += 1
+
+    return face_count
@@ -1,27 +1,91 @@
 # --- src/managers/chunk_manager.py ---
+import os
 import concurrent.futures
 import numpy as np
 from OpenGL.GL import *
-from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, RENDER_DISTANCE_CHUNKS, ID_AIR
-from src.chunk_mesh import block_data_worker_wrapper, mesh_worker_wrapper
+from src.chunk_data import CHUNK_SIZE, MAX_HEIGHT, RENDER_DISTANCE_CHUNKS, ID_AIR, WorldSeed
+from src.chunk_mesh import mesh_snapshot_worker, mesh_patch_worker, lod_mesh_worker
+from src.chunk_neighborhood import neighbor_coords, affected_sections
+from src.chunk_sections import SectionedChunk, SECTION_SIZE
+from src.generation_backend import BACKEND_THREAD, create_generation_backend
 from src.lighting_system import LightingSystem
-from src.opengl_core import create_chunk_buffers_from_data, delete_chunk_buffers
+from src.mesh_cache import MeshCache, MESH_CACHE_DIR, MESH_CACHE_MAX_BYTES
+from src.world_storage import WorldStorage
+from src.section_mesh import SectionMesh
+from src.opengl_core import create_section_buffers, update_section_buffers, delete_chunk_buffers
 
 # Thread Pool Definition hierhin verschoben
 THREAD_POOL_SIZE = 8
 UNLOAD_DISTANCE_BUFFER = 10 #4
 EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE)
 
+# Blockdaten-Generierung: "thread" (EXECUTOR) oder "process" (alle Kerne, Shared Memory)
+GENERATION_BACKEND = BACKEND_THREAD
+GENERATION_PROCESS_WORKERS = None  # None = os.cpu_count()
+
+# Regions-Batching: Fehlen mindestens so viele Chunks (Spawn, Teleport),
+# werden sie in REGION_BATCH_SIZE x REGION_BATCH_SIZE Blöcken generiert
+REGION_BATCH_THRESHOLD = 64
+REGION_BATCH_SIZE = 8
+
+# Welt-Seed (0 = Standardwelt)
+WORLD_SEED = 0
+# Ordner mit vorgenerierten Chunks (siehe pregen.py)
+WORLD_DIR = "worlds/default"
+
+# LOD: ab diesem Abstand (Chunks, Chebyshev) zum Spieler gilt die nächste Stufe
+# (siehe lod_mesh.LOD_FACTORS: 2x, 4x vergröbert); feiner wird erst LOD_HYSTERESIS
+# Chunks vor der Grenze, damit Chunks an der Grenze nicht ständig wechseln
+LOD_DISTANCES = (6, 9)
+LOD_HYSTERESIS = 1
+
+# Block-Änderungen bis zu so vielen betroffenen Voxeln pro Chunk werden direkt im
+# Mesh gepatcht (sofort sichtbar), größere (z.B. weite Lichtänderungen) neu gemesht
+MESH_PATCH_MAX_VOXELS = 16 * 16 * 16
+
+
+def lod_level(distance, current):
+    """LOD-Stufe eines Chunks im Abstand distance, ausgehend von seiner aktuellen Stufe (Hysterese)."""
+    level = current
+    while level < len(LOD_DISTANCES) and distance > LOD_DISTANCES[level]:
+        level += 1
+    while level > 0 and distance <= LOD_DISTANCES[level - 1] - LOD_HYSTERESIS:
+        level -= 1
+    return level
+
 
 class ChunkManager:
-    def __init__(self):
-        self.chunk_data = {}  # {coord: (vao, count, vbo, ebo)}
-        self.world_data = {}  # {coord: numpy_array}
+    def __init__(self, generation_backend=GENERATION_BACKEND, world_seed=WORLD_SEED, world_dir=WORLD_DIR):
+        self.chunk_data = {}  # {coord: {section: SectionMesh}} (ein Mesh pro 16³-Section, LOD: ganzer Chunk in 0)
+        self.world_data = {}  # {coord: SectionedChunk} (komprimierte 16³-Sections)
         self.lighting = LightingSystem(CHUNK_SIZE, MAX_HEIGHT)
 
+        self.world_seed = WorldSeed(world_seed)
+        self.generator = create_generation_backend(generation_backend, EXECUTOR, self.world_seed,
+                                                   GENERATION_PROCESS_WORKERS)
+        self.storage = WorldStorage(world_dir, self.world_seed)
+        self.mesh_cache = (MeshCache(os.path.join(world_dir, MESH_CACHE_DIR), MESH_CACHE_MAX_BYTES)
+                           if MESH_CACHE_MAX_BYTES > 0 else None)
+
         self.data_futures = {}
         self.mesh_futures = {}
 
+        # Versionszähler pro Chunk: steigt bei jeder Änderung, die sein Mesh betrifft
+        # (eigene Blöcke/Licht oder Rand eines Nachbarn). Mesh-Ergebnisse mit
+        # veralteter Version werden verworfen und neu eingereiht.
+        self.chunk_versions = {}
+        self.mesh_versions = {}  # {coord: Version beim Start des laufenden Mesh-Jobs}
+        # Neu zu meshende Sections: wartend (pending) bzw. im laufenden Job (meshing)
+        self.pending_sections = {}
+        self.meshing_sections = {}
+
+        # LOD-Stufe pro Chunk: gewünscht (target) und die der Meshes in chunk_data;
+        # bis das Mesh der neuen Stufe fertig ist, bleibt das alte sichtbar
+        self.target_levels = {}
+        self.chunk_levels = {}
+        self.meshing_levels = {}
+        self._lod_center = None
+
         # Konfiguration
         self.max_chunks_per_frame = 1
         self.max_mesh_builds_per_frame = 3
@@ -31,70 +95,166 @@ class ChunkManager:
         if (cx, cz) in self.world_data:
             # Check bounds
             if 0 <= bx < CHUNK_SIZE and 0 <= by < MAX_HEIGHT and 0 <= bz < CHUNK_SIZE:
-                # Padding beachten: Welt-Daten haben +2 Padding, also Index +1
-                return self.world_data[(cx, cz)][bx + 1, by, bz + 1]
+                return self.world_data[(cx, cz)][bx, by, bz]
         return ID_AIR
 
     def update_block(self, cx, cz, bx, by, bz, new_id):
-        """Setzt Block, berechnet Licht neu und markiert Chunks für Re-Mesh."""
+        """Setzt Block, berechnet Licht neu und patcht die betroffenen Meshes (oder markiert sie für Re-Mesh)."""
         coord = (cx, cz)
         if coord not in self.world_data: return
-
-        local_x, local_z = bx + 1, bz + 1
-        if not (0 < local_x < CHUNK_SIZE + 1 and 0 <= by < MAX_HEIGHT and 0 < local_z < CHUNK_SIZE + 1): return
-
-        old_id = self.world_data[coord][local_x, by, local_z]
-        self.world_data[coord][local_x, by, local_z] = new_id
-
-        # Licht Update
-        self.lighting.update_light_at_position(coord, self.world_data[coord], bx, by, bz, old_id, new_id)
-
-        chunks_to_update = {coord}
-
-        # Padding Sync (Nachbarn informieren)
-        self._sync_neighbors(cx, cz, bx, bz, by, new_id, local_x, local_z, chunks_to_update)
-
-        # Licht Sync und Re-Mesh Trigger
-        for update_coord in chunks_to_update:
-            self.lighting.sync_light_padding(update_coord, self.world_data)
-            ucx, ucz = update_coord
-            for neighbor in [(ucx - 1, ucz), (ucx + 1, ucz), (ucx, ucz - 1), (ucx, ucz + 1)]:
-                if neighbor in self.lighting.light_data:
-                    self.lighting.sync_light_padding(neighbor, self.world_data)
-
-        for r_coord in chunks_to_update:
-            self.force_remesh(r_coord)
-
-    def _sync_neighbors(self, cx, cz, bx, bz, by, new_id, local_x, local_z, chunks_to_update):
-        # ... (Logik für Padding Sync aus alter GameWorld) ...
-        if bx == 0:
-            n = (cx - 1, cz)
-            if n in self.world_data:
-                self.world_data[n][CHUNK_SIZE + 1, by, local_z] = new_id
-                chunks_to_update.add(n)
-        if bx == CHUNK_SIZE - 1:
-            n = (cx + 1, cz)
-            if n in self.world_data:
-                self.world_data[n][0, by, local_z] = new_id
-                chunks_to_update.add(n)
-        if bz == 0:
-            n = (cx, cz - 1)
-            if n in self.world_data:
-                self.world_data[n][local_x, by, CHUNK_SIZE + 1] = new_id
-                chunks_to_update.add(n)
-        if bz == CHUNK_SIZE - 1:
-            n = (cx, cz + 1)
-            if n in self.world_data:
-                self.world_data[n][local_x, by, 0] = new_id
-                chunks_to_update.add(n)
-
-    def force_remesh(self, coord):
+        if not (0 <= bx < CHUNK_SIZE and 0 <= by < MAX_HEIGHT and 0 <= bz < CHUNK_SIZE): return
+
+        old_id = self.world_data[coord][bx, by, bz]
+        self.world_data[coord][bx, by, bz] = new_id
+
+        # Licht Update (auch in den Nachbar-Chunks, siehe LightingSystem.update_light_at_position)
+        light_change = self.lighting.update_light_at_position(coord, self.world_data, bx, by, bz, old_id, new_id)
+
+        # Geänderte Zellen: der Block selbst und alle Zellen mit neuem Licht (chunk-lokal, kann
+        # in die Nachbarn reichen)
+        lo = np.array([bx, by, bz])
+        hi = lo + 1
+        rows = [by]
+        if light_change is not None:
+            light_lo, light_hi, light_rows = light_change
+            lo = np.minimum(lo, light_lo)
+            hi = np.maximum(hi, light_hi)
+            rows += light_rows
+        # Fallback: nur Sections neu meshen, in denen sich Block oder Licht geändert hat (± 1 Zeile)
+        sections = affected_sections(rows, MAX_HEIGHT)
+
+        # Flächen lesen Licht und AO der Nachbarzellen (inkl. Diagonalen) -> Bereich ± 1,
+        # am Rand auch in den Nachbar-Chunks (die den Block über gather_padded sehen)
+        lo -= 1
+        hi += 1
+        for n in [coord] + neighbor_coords(coord):
+            offset = np.array([(n[0] - cx) * CHUNK_SIZE, 0, (n[1] - cz) * CHUNK_SIZE])
+            if not self._patch_mesh(n, lo - offset, hi - offset):
+                self.force_remesh(n, sections)
+
+    def _patch_mesh(self, coord, lo, hi):
+        """
+        Patcht die Flächen im Voxel-Bereich [lo, hi) (chunk-lokal, wird beschnitten)
+        direkt im Mesh und lädt nur die geänderten Slots hoch. Rückgabe False, wenn
+        der Chunk stattdessen neu gemesht werden muss (noch kein Mesh, LOD, Bereich zu groß).
+        """
+        lo = np.maximum(lo, 0)
+        hi = np.minimum(hi, (CHUNK_SIZE, MAX_HEIGHT, CHUNK_SIZE))
+        if np.any(lo >= hi):
+            return True  # Chunk nicht betroffen
+
+        section_meshes = self.chunk_data.get(coord)
+        if (section_meshes is None or coord not in self.lighting.light_data
+                or self.chunk_levels.get(coord, 0) != 0 or np.prod(hi - lo) > MESH_PATCH_MAX_VOXELS):
+            return False
+
+        res = mesh_patch_worker(coord[0], coord[1], self.world_data, self.lighting.light_data, lo, hi,
+                                {section: mesh.faces() for section, mesh in section_meshes.items()})
+        if isinstance(res, Exception):
+            print(f"Mesh Patch Error {coord}: {res}")
+            return False
+
+        # Laufende Mesh-Jobs rechnen mit den alten Daten -> Ergebnis verwerfen und neu einreihen
+        self._bump_version(coord)
+        for section, (removed, new_vertices) in res.items():
+            mesh = section_meshes.get(section)
+            if mesh is None:
+                if new_vertices.size:
+                    section_meshes[section] = self._create_section_mesh(new_vertices)
+                continue
+            runs = mesh.patch(removed, new_vertices)
+            if runs is None:
+                self._recreate_section_buffers(mesh)
+            else:
+                update_section_buffers(mesh.vbo, mesh.vertices, runs)
+        return True
+
+    @staticmethod
+    def _create_section_mesh(vertices):
+        mesh = SectionMesh(vertices)
+        mesh.vao, mesh.vbo, mesh.ebo = create_section_buffers(mesh.vertices, mesh.capacity)
+        return mesh
+
+    @staticmethod
+    def _recreate_section_buffers(mesh):
+        """Neue GPU-Puffer, nachdem die CPU-Kopie (Kapazität) neu angelegt wurde."""
+        delete_chunk_buffers(mesh.vao, mesh.vbo, mesh.ebo)
+        mesh.vao, mesh.vbo, mesh.ebo = create_section_buffers(mesh.vertices, mesh.capacity)
+
+    def _upload_section(self, section_meshes, section, vertices):
+        """Ergebnis eines Mesh-Jobs übernehmen; passt es in den alten Puffer, wird er weiterverwendet."""
+        mesh = section_meshes.get(section)
+        if vertices.size == 0:
+            if mesh is not None:
+                del section_meshes[section]
+                delete_chunk_buffers(mesh.vao, mesh.vbo, mesh.ebo)
+        elif mesh is None:
+            section_meshes[section] = self._create_section_mesh(vertices)
+        elif mesh.set_faces(vertices):
+            update_section_buffers(mesh.vbo, mesh.vertices, [(0, mesh.face_count)])
+        else:
+            self._recreate_section_buffers(mesh)
+
+    def _submit_mesh(self, coord):
+        """
+        Startet das Meshen mit Snapshots der 3x3 Nachbarschaft. Blöcke sind
+        Copy-on-Write-Snapshots, Lichtkarten werden nur ersetzt, nie verändert:
+        der Worker sieht also nie halb geschriebene Daten.
+        """
+        blocks = {n: self.world_data[n].snapshot() for n in [coord] + neighbor_coords(coord) if n in self.world_data}
+        lights = {n: self.lighting.light_data[n] for n in blocks if n in self.lighting.light_data}
+        sections = self.pending_sections.pop(coord, None)
+        level = self._target_level(coord)
+        if coord not in self.chunk_data or self.chunk_levels.get(coord, 0) != level:
+            sections = None  # Noch nie (bzw. in einer anderen LOD-Stufe) gemesht -> alle Sections
+        self.meshing_sections[coord] = sections
+        self.meshing_levels[coord] = level
+        self.mesh_versions[coord] = self.chunk_versions.get(coord, 0)
+        if level > 0:
+            self.mesh_futures[coord] = EXECUTOR.submit(lod_mesh_worker, coord[0], coord[1], blocks, lights, level)
+        else:
+            self.mesh_futures[coord] = EXECUTOR.submit(mesh_snapshot_worker, coord[0], coord[1], blocks, lights,
+                                                       None if sections is None else sorted(sections),
+                                                       self.mesh_cache)
+
+    def _target_level(self, coord):
+        """Gewünschte LOD-Stufe; neue Chunks starten direkt in der Stufe ihres Abstands."""
+        if coord not in self.target_levels:
+            level = 0
+            if self._lod_center is not None:
+                distance = max(abs(coord[0] - self._lod_center[0]), abs(coord[1] - self._lod_center[1]))
+                level = lod_level(distance, 0)
+            self.target_levels[coord] = level
+        return self.target_levels[coord]
+
+    def _update_lod_levels(self, pcx, pcz):
+        """Wählt bei jedem Chunk-Wechsel des Spielers die LOD-Stufen neu und meshed gewechselte Chunks neu."""
+        if self._lod_center == (pcx, pcz):
+            return
+        self._lod_center = (pcx, pcz)
+        for coord, current in list(self.target_levels.items()):
+            level = lod_level(max(abs(coord[0] - pcx), abs(coord[1] - pcz)), current)
+            if level != current:
+                self.target_levels[coord] = level
+                self.force_remesh(coord)
+
+    def _bump_version(self, coord):
+        self.chunk_versions[coord] = self.chunk_versions.get(coord, 0) + 1
+
+    def _mark_sections(self, coord, sections):
+        """Merkt Sections für das nächste Meshen vor (None = alle)."""
+        if sections is None:
+            sections = range(MAX_HEIGHT // SECTION_SIZE)
+        self.pending_sections.setdefault(coord, set()).update(sections)
+
+    def force_remesh(self, coord, sections=None):
+        """Meshed die angegebenen Sections (None = alle) des Chunks neu."""
         if coord not in self.world_data or coord not in self.lighting.light_data: return
+        self._bump_version(coord)
+        self._mark_sections(coord, sections)
+        # Läuft schon ein Job, wird sein (jetzt veraltetes) Ergebnis verworfen und neu gemesht
         if coord not in self.mesh_futures:
-            cx, cz = coord
-            light_map = self.lighting.light_data[coord]
-            future = EXECUTOR.submit(mesh_worker_wrapper, cx, cz, self.world_data[coord], light_map)
-            self.mesh_futures[coord] = future
+            self._submit_mesh(coord)
 
     def update(self, player_pos):
         """Haupt-Update Loop für Chunk Loading UND Unloading."""
@@ -102,7 +262,8 @@ class ChunkManager:
         player_chunk_x = int(px // CHUNK_SIZE)  
         player_chunk_z = int(pz // CHUNK_SIZE)
 
-        # 1. Neue Jobs erstellen (LADEN)
+        # 1. LOD-Stufen nach Abstand, dann neue Jobs erstellen (LADEN)
+        self._update_lod_levels(player_chunk_x, player_chunk_z)
         self._schedule_chunks(player_chunk_x, player_chunk_z)
 
         # 2. Alte Chunks entfernen (ENTLADEN) <--- NEU
@@ -132,9 +293,8 @@ class ChunkManager:
         for coord in to_remove:
             # 1. OpenGL Buffer löschen (WICHTIG gegen VRAM Leaks!)
             if coord in self.chunk_data:
-                vao, count, vbo, ebo = self.chunk_data[coord]
-                delete_chunk_buffers(vao, vbo, ebo)
-                del self.chunk_data[coord]
+                for mesh in self.chunk_data.pop(coord).values():
+                    delete_chunk_buffers(mesh.vao, mesh.vbo, mesh.ebo)
 
             # 2. Block-Daten löschen (spart RAM)
             # Wir behalten sie optional im Lighting System oder World Data,
@@ -149,27 +309,70 @@ class ChunkManager:
 
             # 4. Laufende Futures abbrechen (optional, aber sauberer)
             if coord in self.data_futures:
-                del self.data_futures[coord]  # Future läuft im Hintergrund weiter, Ergebnis wird aber ignoriert
+                # Future läuft im Hintergrund weiter, Ergebnis wird aber ignoriert
+                self.generator.release(self.data_futures.pop(coord))
             if coord in self.mesh_futures:
                 del self.mesh_futures[coord]
+            self.mesh_versions.pop(coord, None)
+            self.chunk_versions.pop(coord, None)
+            self.pending_sections.pop(coord, None)
+            self.meshing_sections.pop(coord, None)
+            self.target_levels.pop(coord, None)
+            self.chunk_levels.pop(coord, None)
+            self.meshing_levels.pop(coord, None)
+
+    def _schedule_region_batches(self, pcx, pcz):
+        """Bündelt große Ladewellen (Spawn, weite Teleports) zu Regions-Jobs."""
+        R = RENDER_DISTANCE_CHUNKS
+        missing = {
+            (cx, cz)
+            for cx in range(pcx - R, pcx + R + 1)
+            for cz in range(pcz - R, pcz + R + 1)
+            if (cx, cz) not in self.world_data and (cx, cz) not in self.data_futures
+            and not self.storage.has_chunk(cx, cz)
+        }
+        if len(missing) < REGION_BATCH_THRESHOLD:
+            return
+
+        S = REGION_BATCH_SIZE
+        blocks = []
+        for bx0 in range(pcx - R, pcx + R + 1, S):
+            for bz0 in range(pcz - R, pcz + R + 1, S):
+                w = min(S, pcx + R + 1 - bx0)
+                h = min(S, pcz + R + 1 - bz0)
+                needed = [(bx0 + i, bz0 + j) for i in range(w) for j in range(h) if (bx0 + i, bz0 + j) in missing]
+                # Kaum fehlende Chunks im Block -> lieber einzeln laden
+                if len(needed) * 2 < w * h:
+                    continue
+                center_dist = (bx0 + w / 2 - pcx) ** 2 + (bz0 + h / 2 - pcz) ** 2
+                blocks.append((center_dist, bx0, bz0, w, h, needed))
+
+        # Nahe Blöcke zuerst einreihen
+        for _, bx0, bz0, w, h, needed in sorted(blocks):
+            futures = self.generator.submit_region(bx0, bz0, w, h)
+            for coord in needed:
+                self.data_futures[coord] = futures[coord]
 
     def _schedule_chunks(self, pcx, pcz):
         R = RENDER_DISTANCE_CHUNKS
+        self._schedule_region_batches(pcx, pcz)
         for cx in range(pcx - R, pcx + R + 1):
             for cz in range(pcz - R, pcz + R + 1):
                 coord = (cx, cz)
                 if coord not in self.world_data and coord not in self.data_futures:
-                    self.data_futures[coord] = EXECUTOR.submit(block_data_worker_wrapper, cx, cz)
+                    if self.storage.has_chunk(cx, cz):
+                        # Vorgenerierter Chunk: Blöcke (und Licht) von der Platte laden
+                        self.data_futures[coord] = EXECUTOR.submit(self.storage.load_chunk, cx, cz)
+                    else:
+                        self.data_futures[coord] = self.generator.submit(cx, cz)
                 elif coord in self.world_data and coord not in self.chunk_data and coord not in self.mesh_futures:
                     if coord not in self.lighting.light_data:
                         try:
-                            self.lighting.init_chunk_lighting(coord, self.world_data[coord])
+                            self.lighting.init_chunk_lighting(coord, self.world_data[coord].to_dense())
                         except Exception:
                             continue
-                    light_map = self.lighting.light_data.get(coord, None)
-                    if light_map is not None:
-                        self.mesh_futures[coord] = EXECUTOR.submit(mesh_worker_wrapper, cx, cz, self.world_data[coord],
-                                                                   light_map)
+                    if coord in self.lighting.light_data:
+                        self._submit_mesh(coord)
 
     def _process_futures(self, px, pz):
         # Helper für Sortierung nach Distanz
@@ -184,26 +387,29 @@ class ChunkManager:
         processed = 0
         for coord in finished_data:
             if processed >= self.max_chunks_per_frame: break
+            future = self.data_futures.pop(coord)
             try:
-                res = self.data_futures[coord].result()
+                res = future.result()
                 if isinstance(res, Exception): raise res
-                self.world_data[coord] = res
-                self.lighting.init_chunk_lighting(coord, res)
-
-                # Sync & Trigger Neighbors
-                self.lighting.sync_light_padding(coord, self.world_data)
-                cx, cz = coord
-                for n in [(cx - 1, cz), (cx + 1, cz), (cx, cz - 1), (cx, cz + 1)]:
-                    if n in self.lighting.light_data:
-                        self.lighting.sync_light_padding(n, self.world_data)
-                        self.force_remesh(n)
-                self.lighting.sync_light_padding(coord, self.world_data)
-
-                del self.data_futures[coord]
+                # Generator liefert nur Blockdaten, WorldStorage.load_chunk (block_data, light_map)
+                block_data, light_map = res if isinstance(res, tuple) else (res, None)
+                if light_map is None:
+                    self.lighting.init_chunk_lighting(coord, block_data)
+                else:
+                    self.lighting.light_data[coord] = light_map
+                self.world_data[coord] = SectionedChunk.from_dense(block_data)
+                self._bump_version(coord)
+
+                # Nachbarn (inkl. Diagonalen für AO) haben bisher ihren eigenen Rand fortgesetzt
+                for n in neighbor_coords(coord):
+                    self.force_remesh(n)
+
                 processed += 1
             except Exception as e:
                 print(f"Chunk Data Error {coord}: {e}")
-                del self.data_futures[coord]
+            finally:
+                # Prozess-Backend: Ergebnis ist eine Sicht auf Shared Memory, erst jetzt wieder frei
+                self.generator.release(future)
 
         # Mesh Futures
         finished_mesh = sorted([c for c, f in self.mesh_futures.items() if f.done()], key=dist)
@@ -211,29 +417,45 @@ class ChunkManager:
         for coord in finished_mesh:
             if built >= self.max_mesh_builds_per_frame: break
             try:
-                verts, inds = self.mesh_futures[coord].result()
-                if coord in self.chunk_data:
-                    old_vao, _, old_vbo, old_ebo = self.chunk_data[coord]
-                    delete_chunk_buffers(old_vao, old_vbo, old_ebo)
+                res = self.mesh_futures.pop(coord).result()
+                version = self.mesh_versions.pop(coord, None)
+                sections = self.meshing_sections.pop(coord, None)
+                level = self.meshing_levels.pop(coord, 0)
+                if isinstance(res, Exception): raise res
 
-                if inds.size > 0:
-                    self.chunk_data[coord] = create_chunk_buffers_from_data(verts, inds)
-                elif coord in self.chunk_data:
-                    del self.chunk_data[coord]
+                if version != self.chunk_versions.get(coord):
+                    # Chunk oder Nachbar hat sich während des Meshens geändert -> neu einreihen
+                    if coord in self.world_data and coord in self.lighting.light_data:
+                        self._mark_sections(coord, sections)
+                        self._submit_mesh(coord)
+                    continue
+
+                # LOD-Wechsel: die Meshes der alten Stufe erst jetzt ersetzen (kein Loch bis dahin)
+                if coord in self.chunk_data and self.chunk_levels.get(coord, 0) != level:
+                    for mesh in self.chunk_data.pop(coord).values():
+                        delete_chunk_buffers(mesh.vao, mesh.vbo, mesh.ebo)
+                self.chunk_levels[coord] = level
+
+                # Indizes folgen immer dem Quad-Muster, der EBO kommt aus quad_indices
+                section_meshes = self.chunk_data.setdefault(coord, {})
+                for section, (verts, inds) in res.items():
+                    self._upload_section(section_meshes, section, verts)
 
-                del self.mesh_futures[coord]
                 built += 1
             except Exception as e:
                 print(f"Mesh Error {coord}: {e}")
-                del self.mesh_futures[coord]
 
-    def render(self, is_chunk_visible_func, frustum_planes):
-        """Rendert alle sichtbaren Chunks."""
-        for coord, (vao, count, _, _) in self.chunk_data.items():
-            if count > 0 and vao is not None:
-                if is_chunk_visible_func(frustum_planes, coord[0], coord[1]):
-                    glBindVertexArray(vao)
-                    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+    def render(self, is_chunk_visible_func, frustum_planes, chunk_offset_loc):
+        """Rendert alle sichtbaren Chunks Section für Section (Vertices chunk-lokal, Offset per Uniform)."""
+        for coord, section_meshes in self.chunk_data.items():
+            if not section_meshes or not is_chunk_visible_func(frustum_planes, coord[0], coord[1]):
+                continue
+            glUniform3f(chunk_offset_loc, coord[0] * CHUNK_SIZE, 0.0, coord[1] * CHUNK_SIZE)
+            for mesh in section_meshes.values():
+                if mesh.face_count > 0:
+                    glBindVertexArray(mesh.vao)
+                    glDrawElements(GL_TRIANGLES, mesh.index_count, GL_UNSIGNED_INT, None)
 
     def shutdown(self):
-        EXECUTOR.shutdown(wait=True)
\ No newline at end of file
+        EXECUTOR.shutdown(wait=True)
+        self.generator.shutdown()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# --- src/managers/horizon_manager.py ---
+from src.chunk_data import CHUNK_SIZE, RENDER_DISTANCE_CHUNKS
+from src.horizon import HORIZON_TILE_CHUNKS, horizon_tile_chunks, horizon_tile_worker
+from src.managers.chunk_manager import EXECUTOR
+
+# --- EINSTELLUNGEN ---
+# Reichweite des Horizonts in Chunks (Chebyshev); 32 Chunks = 512 Blöcke = Far-Plane des Players
+HORIZON_RADIUS_CHUNKS = 32
+# Gleichzeitige Horizont-Jobs im geteilten Pool (die echten Chunks sollen nicht warten)
+HORIZON_MAX_JOBS = 2
+# Hochgeladene Kacheln pro Frame
+HORIZON_UPLOADS_PER_FRAME = 2
+
+
+class HorizonManager:
+    """
+    Horizont jenseits von RENDER_DISTANCE_CHUNKS: grobe, eingefärbte Höhenfeld-
+    Kacheln aus der 2D-Noise (siehe horizon.py), ohne Blockdaten, Licht oder Mesher.
+
+    Kacheln werden ringweise vom Spieler aus nachgeladen, nahe zuerst. Kacheln, die
+    komplett im Bereich der echten Chunks liegen, werden weder gebaut noch
+    gezeichnet; bei teilweise überlappenden verwirft der Shader den inneren Teil.
+    """
+
+    def __init__(self, renderer, world_seed, radius_chunks=HORIZON_RADIUS_CHUNKS):
+        self.renderer = renderer
+        self.world_seed = world_seed
+        self.radius_chunks = radius_chunks
+
+        self.tiles = {}  # {(tx, tz): (vao, vbo)}
+        self.futures = {}  # {(tx, tz): Future}
+        self.player_chunk = None
+        self._wanted = []  # Fehlende Kacheln, nächste zuerst
+
+    def _inner_chunks(self):
+        """Chunk-Bereich der echten Chunks [cx0, cx1) x [cz0, cz1) (wie ChunkManager._schedule_chunks)."""
+        pcx, pcz = self.player_chunk
+        R = RENDER_DISTANCE_CHUNKS
+        return pcx - R, pcx + R + 1, pcz - R, pcz + R + 1
+
+    def _covered(self, tile):
+        """True, wenn die Kachel komplett aus echten Chunks besteht."""
+        cx0, cx1, cz0, cz1 = horizon_tile_chunks(tile)
+        ix0, ix1, iz0, iz1 = self._inner_chunks()
+        return ix0 <= cx0 and cx1 <= ix1 and iz0 <= cz0 and cz1 <= iz1
+
+    def _tile_range(self):
+        pcx, pcz = self.player_chunk
+        R = self.radius_chunks
+        return ((pcx - R) // HORIZON_TILE_CHUNKS, (pcx + R) // HORIZON_TILE_CHUNKS,
+                (pcz - R) // HORIZON_TILE_CHUNKS, (pcz + R) // HORIZON_TILE_CHUNKS)
+
+    def _on_player_chunk_changed(self):
+        tx0, tx1, tz0, tz1 = self._tile_range()
+        ptx = self.player_chunk[0] // HORIZON_TILE_CHUNKS
+        ptz = self.player_chunk[1] // HORIZON_TILE_CHUNKS
+
+        # Kacheln außerhalb der Reichweite (+1 Kachel Puffer gegen Hin- und Herladen) freigeben
+        for tile in list(self.tiles):
+            if not (tx0 - 1 <= tile[0] <= tx1 + 1 and tz0 - 1 <= tile[1] <= tz1 + 1):
+                self.renderer.delete_tile(*self.tiles.pop(tile))
+        for tile in list(self.futures):
+            if not (tx0 <= tile[0] <= tx1 and tz0 <= tile[1] <= tz1):
+                del self.futures[tile]  # Läuft weiter, Ergebnis wird ignoriert
+
+        # Ringe um die Kachel des Spielers
+        wanted = [
+            (tx, tz)
+            for tx in range(tx0, tx1 + 1)
+            for tz in range(tz0, tz1 + 1)
+            if (tx, tz) not in self.tiles and not self._covered((tx, tz))
+        ]
+        wanted.sort(key=lambda t: max(abs(t[0] - ptx), abs(t[1] - ptz)), reverse=True)
+        self._wanted = wanted
+
+    def update(self, player_pos):
+        player_chunk = (int(player_pos[0] // CHUNK_SIZE), int(player_pos[2] // CHUNK_SIZE))
+        if player_chunk != self.player_chunk:
+            self.player_chunk = player_chunk
+            self._on_player_chunk_changed()
+
+        # Fertige Kacheln hochladen
+        uploaded = 0
+        for tile in [t for t, f in self.futures.items() if f.done()]:
+            if uploaded >= HORIZON_UPLOADS_PER_FRAME:
+                break
+            res = self.futures.pop(tile).result()
+            if isinstance(res, Exception):
+                print(f"Horizont Error {tile}: {res}")
+                continue
+            self.tiles[tile] = self.renderer.create_tile(res)
+            uploaded += 1
+
+        # Neue Jobs, nächste Ringe zuerst
+        while self._wanted and len(self.futures) < HORIZON_MAX_JOBS:
+            tile = self._wanted.pop()
+            if tile not in self.tiles and tile not in self.futures:
+                self.futures[tile] = EXECUTOR.submit(horizon_tile_worker, tile[0], tile[1], self.world_seed)
+
+    def render(self, view, projection):
+        if self.player_chunk is None:
+            return
+        visible = [vao for tile, (vao, _) in self.tiles.items() if not self._covered(tile)]
+        if not visible:
+            return
+        ix0, ix1, iz0, iz1 = self._inner_chunks()
+        self.renderer.render(visible, view, projection,
+                             (ix0 * CHUNK_SIZE, iz0 * CHUNK_SIZE), (ix1 * CHUNK_SIZE, iz1 * CHUNK_SIZE))
+
+    def shutdown(self):
+        for vao, vbo in self.tiles.values():
+            self.renderer.delete_tile(vao, vbo)
+        self.tiles.clear()
+        self.futures.clear()
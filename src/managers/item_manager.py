@@ -2,7 +2,7 @@
 import math
 import random
 import numpy as np
-from src.block_definitions import ID_AIR, NON_SOLID_BLOCKS_NUMBA
+from src.block_definitions import ID_AIR, BLOCK_SOLID
 from src.chunk_data import CHUNK_SIZE # Hinzufügen
 
 # --- EINSTELLUNGEN ---
@@ -69,16 +69,16 @@ class DroppedItem:
 
         if coord in world_data:
             chunk = world_data[coord]
-            # Lokale Indizes (Padding beachten: +1)
-            lx = block_x - cx * CHUNK_SIZE + 1
-            lz = block_z - cz * CHUNK_SIZE + 1
+            # Lokale Indizes im Chunk
+            lx = block_x - cx * CHUNK_SIZE
+            lz = block_z - cz * CHUNK_SIZE
 
             # Überprüfen, ob der Block unter dem Item solide ist
-            if 0 <= lx < CHUNK_SIZE + 2 and 0 <= block_y < chunk.shape[1] and 0 <= lz < CHUNK_SIZE + 2:
+            if 0 <= lx < CHUNK_SIZE and 0 <= block_y < chunk.shape[1] and 0 <= lz < CHUNK_SIZE:
                 block_id = chunk[lx, block_y, lz]
 
-                # Prüfe, ob der Block solide ist (Nicht Luft oder Blätter)
-                if block_id != ID_AIR and block_id not in NON_SOLID_BLOCKS_NUMBA:
+                # Prüfe, ob der Block solide ist (Registry: Luft und Wasser nicht)
+                if BLOCK_SOLID[block_id]:
                     # Kollision mit dem Boden! Setze Y auf die Oberfläche des Blocks
                     self.pos[1] = block_y + 1.0  # Oberfläche ist Y+1
                     self.velocity[1] = 0.0  # Vertikal-Geschw. stoppen
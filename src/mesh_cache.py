@@ -0,0 +1,163 @@
+# --- src/mesh_cache.py ---
+import os
+import mmap
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .chunk_sections import SECTION_SIZE
+from .geometry_constants import VERTEX_WORDS
+
+# Bei Änderungen an Meshern, Licht-/AO-Berechnung oder Vertex-Format erhöhen
+MESHER_VERSION = 1
+# Rohe uint32-Vertices ohne Header (np.load braucht zum Parsen länger als das Lesen)
+MESH_CACHE_FILE_SUFFIX = ".verts"
+# Unterordner der Welt und Obergrenze in Bytes (0 = aus); ChunkManager und pregen teilen den Cache
+MESH_CACHE_DIR = "mesh_cache"
+MESH_CACHE_MAX_BYTES = 512 * 2 ** 20
+
+
+def mesh_cache_key(block_data, light_map, section, fingerprint):
+    """
+    Inhaltsadresse des Meshes einer Section: Hash über die gepaddeten Block- und
+    Lichtdaten, die das Meshen der Section liest (Section ± 1 Zeile inkl. Rand der
+    Nachbar-Chunks), den Section-Index (die Y-Position steckt in den Vertices)
+    und den Mesher-Fingerabdruck (siehe mesher_fingerprint).
+    """
+    y0 = max(section * SECTION_SIZE - 1, 0)
+    y1 = min((section + 1) * SECTION_SIZE + 1, block_data.shape[1])
+    # sha1 ist hier (Hardware-Unterstützung) gut doppelt so schnell wie blake2b
+    h = hashlib.sha1(fingerprint)
+    h.update(np.array([section, y0, y1], dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(block_data[:, y0:y1]).data)
+    h.update(np.ascontiguousarray(light_map[:, y0:y1]).data)
+    return h.hexdigest()
+
+
+def mesher_fingerprint(*parts):
+    """Hash über MESHER_VERSION und alle Einstellungen/Tabellen, die das Mesh beeinflussen."""
+    h = hashlib.sha1(str(MESHER_VERSION).encode())
+    for part in parts:
+        h.update(np.ascontiguousarray(part).tobytes() if isinstance(part, np.ndarray) else repr(part).encode())
+    return h.digest()
+
+
+def _map_vertices(path):
+    """Vertices einer Cache-Datei, memory-mapped (nur lesen)."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % (VERTEX_WORDS * 4 * 4):
+            raise ValueError(f"unvollständige Mesh-Datei {path}")
+        if size == 0:
+            # Leere Dateien lassen sich nicht mappen
+            return np.zeros((0, VERTEX_WORDS), dtype=np.uint32)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(data, dtype=np.uint32).reshape(-1, VERTEX_WORDS)
+
+
+class MeshCache:
+    """
+    Inhaltsadressierter Mesh-Cache auf der Platte (eine Datei pro Section-Mesh).
+
+    Unveränderte Chunks ergeben beim erneuten Betreten denselben Schlüssel
+    (siehe mesh_cache_key), ein Treffer überspringt das Meshen komplett. Treffer
+    werden per Memory-Mapping gelesen. Gespeichert werden nur die Vertices,
+    die Indizes folgen immer dem Quad-Muster (section_mesh.quad_indices).
+
+    Größe begrenzt auf max_bytes, verdrängt wird der am längsten nicht benutzte
+    Eintrag (LRU; die Reihenfolge überlebt Neustarts über die mtime der Dateien).
+    Thread-sicher, get/put laufen in den Mesh-Workern.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: Dateigröße}, ältester Zugriff zuerst
+        self._total_bytes = 0
+
+        if os.path.isdir(cache_dir):
+            found = []
+            for entry in os.scandir(cache_dir):
+                if entry.name.endswith(MESH_CACHE_FILE_SUFFIX):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-len(MESH_CACHE_FILE_SUFFIX)], stat.st_size))
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + MESH_CACHE_FILE_SUFFIX)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Vertices (memory-mapped, nur lesen) oder None bei einem Fehlschlag."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            os.utime(path)
+            vertices = _map_vertices(path)
+        except (OSError, ValueError):
+            # Datei fehlt oder ist kaputt -> wie ein Fehlschlag behandeln
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return vertices
+
+    def put(self, key, vertices):
+        """Speichert ein Mesh (atomar über eine temporäre Datei); Fehler beim Schreiben werden ignoriert."""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.ascontiguousarray(vertices, dtype=np.uint32).tofile(tmp_path)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def _forget(self, key):
+        self._total_bytes -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        """Ältester Zugriff zuerst löschen, bis die Größe wieder passt (Lock muss gehalten werden)."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
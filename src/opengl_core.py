@@ -6,15 +6,42 @@ from PIL import Image
 import ctypes
 import numpy as np
 from pyrr import Matrix44
-from .block_definitions import get_texture_paths
+from .block_definitions import get_texture_paths, BLOCK_FACE_TEXTURES
+from .section_mesh import quad_indices
+from .horizon import horizon_grid_indices, HORIZON_VERTEX_FLOATS
+from .geometry_constants import (
+    CUBE_UV_AXES, CUBE_UV_SIGNS, VERTEX_WORDS,
+    PACKED_X_SHIFT, PACKED_Y_SHIFT, PACKED_Z_SHIFT, PACKED_FACE_SHIFT,
+    PACKED_XZ_MASK, PACKED_Y_MASK, PACKED_FACE_MASK, PACKED_TEX_MASK, PACKED_LIGHT_SHIFT, PACKED_LIGHT_MASK
+)
+
+
+def _packed_format_glsl():
+    """GLSL-Konstanten für das gepackte Vertex-Format, direkt aus geometry_constants erzeugt."""
+    axes = ", ".join(f"ivec2({u}, {v})" for u, v in CUBE_UV_AXES)
+    signs = ", ".join(f"vec2({u}.0, {v}.0)" for u, v in CUBE_UV_SIGNS)
+    return f"""
+const ivec2 UV_AXES[6] = ivec2[6]({axes});
+const vec2 UV_SIGNS[6] = vec2[6]({signs});
+const uint X_SHIFT = {PACKED_X_SHIFT}u;
+const uint Y_SHIFT = {PACKED_Y_SHIFT}u;
+const uint Z_SHIFT = {PACKED_Z_SHIFT}u;
+const uint FACE_SHIFT = {PACKED_FACE_SHIFT}u;
+const uint XZ_MASK = {PACKED_XZ_MASK}u;
+const uint Y_MASK = {PACKED_Y_MASK}u;
+const uint FACE_MASK = {PACKED_FACE_MASK}u;
+const uint TEX_MASK = {PACKED_TEX_MASK}u;
+const uint LIGHT_SHIFT = {PACKED_LIGHT_SHIFT}u;
+const uint LIGHT_MASK = {PACKED_LIGHT_MASK}u;
+"""
+
 
 # --- STANDARD CHUNK SHADERS ---
+# Gepackte Vertices (2 x uint32, siehe geometry_constants): Position chunk-lokal,
+# die Welt-Position kommt aus u_chunk_offset, die UVs aus Face + Position (GL_REPEAT)
 VERTEX_SRC = """
 #version 330 core
-layout(location = 0) in vec3 a_position;
-layout(location = 1) in vec2 a_texcoord;
-layout(location = 2) in float a_texid;
-layout(location = 3) in float a_light;
+layout(location = 0) in uvec2 a_packed;
 
 out vec2 v_texcoord;
 flat out int v_texid;
@@ -23,12 +50,20 @@ out float v_light;
 uniform mat4 model;
 uniform mat4 view;
 uniform mat4 projection;
-
+uniform vec3 u_chunk_offset;
+""" + _packed_format_glsl() + """
 void main() {
-    gl_Position = projection * view * model * vec4(a_position, 1.0);
-    v_texcoord = a_texcoord;
-    v_texid = int(round(a_texid));
-    v_light = a_light / 15.0;
+    uint word0 = a_packed.x;
+    uint word1 = a_packed.y;
+    vec3 local_pos = vec3(float((word0 >> X_SHIFT) & XZ_MASK),
+                          float((word0 >> Y_SHIFT) & Y_MASK),
+                          float((word0 >> Z_SHIFT) & XZ_MASK));
+    int face = int((word0 >> FACE_SHIFT) & FACE_MASK);
+
+    gl_Position = projection * view * model * vec4(local_pos + u_chunk_offset, 1.0);
+    v_texcoord = vec2(local_pos[UV_AXES[face].x], local_pos[UV_AXES[face].y]) * UV_SIGNS[face];
+    v_texid = int(word1 & TEX_MASK);
+    v_light = float((word1 >> LIGHT_SHIFT) & LIGHT_MASK) / float(LIGHT_MASK);
 }
 """
 
@@ -122,6 +157,50 @@ void main() {
 """
 
 
+# --- HORIZON SHADERS (Höhenfeld-Kacheln jenseits der geladenen Chunks) ---
+# Farbe pro Block-ID aus u_block_colors (Mittelwert der Oberseiten-Textur); innerhalb
+# der geladenen Chunks (u_inner_min/max, Welt-XZ) wird verworfen, dort liegt echtes Terrain
+HORIZON_VERTEX_SRC = """
+#version 330 core
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec2 a_block_shade;
+
+out vec2 v_world_xz;
+flat out int v_block_id;
+out float v_shade;
+
+uniform mat4 view;
+uniform mat4 projection;
+
+void main() {
+    gl_Position = projection * view * vec4(a_position, 1.0);
+    v_world_xz = a_position.xz;
+    v_block_id = int(a_block_shade.x);
+    v_shade = a_block_shade.y;
+}
+"""
+
+HORIZON_FRAGMENT_SRC = """
+#version 330 core
+in vec2 v_world_xz;
+flat in int v_block_id;
+in float v_shade;
+
+out vec4 out_color;
+
+uniform vec3 u_block_colors[BLOCK_COUNT];
+uniform vec2 u_inner_min;
+uniform vec2 u_inner_max;
+
+void main() {
+    if (all(greaterThan(v_world_xz, u_inner_min)) && all(lessThan(v_world_xz, u_inner_max))) {
+        discard;
+    }
+    out_color = vec4(u_block_colors[v_block_id] * v_shade, 1.0);
+}
+"""
+
+
 class LineRenderer:
     def __init__(self):
         self.shader = OpenGL.GL.shaders.compileProgram(
@@ -283,6 +362,91 @@ class CrackRenderer:
         glBindVertexArray(0)
 
 
+class HorizonRenderer:
+    """
+    Zeichnet die Horizont-Kacheln (siehe horizon.py). Alle Kacheln teilen sich
+    einen EBO, weil ihr Gitter gleich ist; pro Kachel gibt es nur VAO und VBO.
+    """
+
+    def __init__(self):
+        colors = block_top_colors()
+        block_count = len(colors)
+        self.shader = OpenGL.GL.shaders.compileProgram(
+            OpenGL.GL.shaders.compileShader(HORIZON_VERTEX_SRC, GL_VERTEX_SHADER),
+            OpenGL.GL.shaders.compileShader(HORIZON_FRAGMENT_SRC.replace("BLOCK_COUNT", str(block_count)),
+                                            GL_FRAGMENT_SHADER),
+            validate=False
+        )
+        self.view_loc = glGetUniformLocation(self.shader, "view")
+        self.proj_loc = glGetUniformLocation(self.shader, "projection")
+        self.inner_min_loc = glGetUniformLocation(self.shader, "u_inner_min")
+        self.inner_max_loc = glGetUniformLocation(self.shader, "u_inner_max")
+
+        glUseProgram(self.shader)
+        glUniform3fv(glGetUniformLocation(self.shader, "u_block_colors"), block_count, colors)
+
+        indices = horizon_grid_indices()
+        self.index_count = indices.size
+        self.ebo = glGenBuffers(1)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+
+    def create_tile(self, vertices):
+        """Lädt die Vertices einer Kachel hoch. Rückgabe: (vao, vbo)."""
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+
+        stride = HORIZON_VERTEX_FLOATS * vertices.itemsize
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(3 * vertices.itemsize))
+        glBindVertexArray(0)
+        return vao, vbo
+
+    def delete_tile(self, vao, vbo):
+        glDeleteVertexArrays(1, [vao])
+        glDeleteBuffers(1, [vbo])
+
+    def render(self, tiles, view, projection, inner_min, inner_max):
+        """tiles: Liste von VAOs; inner_min/max: Welt-XZ-Rechteck der geladenen Chunks."""
+        glUseProgram(self.shader)
+        glUniformMatrix4fv(self.view_loc, 1, GL_FALSE, view.astype('float32'))
+        glUniformMatrix4fv(self.proj_loc, 1, GL_FALSE, projection.astype('float32'))
+        glUniform2f(self.inner_min_loc, *inner_min)
+        glUniform2f(self.inner_max_loc, *inner_max)
+        for vao in tiles:
+            glBindVertexArray(vao)
+            glDrawElements(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None)
+        glBindVertexArray(0)
+
+
+def block_top_colors():
+    """
+    Mittlere Farbe (RGB, 0..1) der Oberseiten-Textur pro Block-ID bis zur höchsten
+    ID mit Textur (als Uniform-Array klein genug), grau ohne Textur.
+    """
+    texture_paths = get_texture_paths()
+    top_textures = BLOCK_FACE_TEXTURES[:, 0]
+    colors = np.full((int(np.flatnonzero(top_textures >= 0).max()) + 1, 3), 0.5, dtype=np.float32)
+    for block_id, tex_index in enumerate(top_textures[:len(colors)]):
+        if 0 <= tex_index < len(texture_paths):
+            try:
+                img = Image.open(texture_paths[int(tex_index)]).convert("RGBA")
+            except (FileNotFoundError, OSError):
+                continue
+            rgba = np.asarray(img, dtype=np.float32).reshape(-1, 4) / 255.0
+            # Durchsichtige Pixel (Blätter) nicht mitzählen
+            opaque = rgba[rgba[:, 3] >= 0.5]
+            if opaque.size:
+                colors[block_id] = opaque[:, :3].mean(axis=0)
+    return colors
+
+
 def init_window(width, height, title):
     if not glfw.init(): raise Exception("GLFW init failed")
     glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
@@ -357,29 +521,39 @@ def setup_textures(shader):
     return textures
 
 
-def create_chunk_buffers_from_data(verts, inds):
-    if inds.size == 0: return None, 0, None, None
+def create_section_buffers(vertices, capacity):
+    """
+    Legt VAO/VBO/EBO für ein SectionMesh an: der VBO wird mit der vollen CPU-Kopie
+    (inkl. Reserve) gefüllt, der EBO enthält das feste Quad-Index-Muster für
+    capacity Flächen. Rückgabe: (vao, vbo, ebo).
+    """
     vao = glGenVertexArrays(1)
     glBindVertexArray(vao)
     vbo = glGenBuffers(1)
     ebo = glGenBuffers(1)
     glBindBuffer(GL_ARRAY_BUFFER, vbo)
-    glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_DYNAMIC_DRAW)
+    inds = quad_indices(capacity)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, inds.nbytes, inds, GL_STATIC_DRAW)
 
-    # 7 Floats pro Vertex: x, y, z, u, v, tex_id, light
-    stride = 7 * verts.itemsize
-    glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+    # Gepackt: 2 x uint32 pro Vertex (Integer-Attribut, wird im Shader entpackt)
+    stride = VERTEX_WORDS * vertices.itemsize
+    glVertexAttribIPointer(0, VERTEX_WORDS, GL_UNSIGNED_INT, stride, ctypes.c_void_p(0))
     glEnableVertexAttribArray(0)
-    glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(3 * 4))
-    glEnableVertexAttribArray(1)
-    glVertexAttribPointer(2, 1, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(5 * 4))
-    glEnableVertexAttribArray(2)
-    glVertexAttribPointer(3, 1, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(6 * 4))
-    glEnableVertexAttribArray(3)
     glBindVertexArray(0)
-    return vao, inds.size, vbo, ebo
+    return vao, vbo, ebo
+
+
+def update_section_buffers(vbo, vertices, runs):
+    """Lädt die Flächen-Slots [(start, stop), ...] aus der CPU-Kopie per glBufferSubData hoch."""
+    face_bytes = 4 * VERTEX_WORDS * vertices.itemsize
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+    for start, stop in runs:
+        if stop > start:
+            glBufferSubData(GL_ARRAY_BUFFER, start * face_bytes, (stop - start) * face_bytes,
+                            vertices[start * 4:stop * 4])
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
 
 
 def delete_chunk_buffers(vao, vbo, ebo):
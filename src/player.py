@@ -3,6 +3,8 @@ import math
 import glfw
 from pyrr import Matrix44
 
+from src.block_definitions import BLOCK_SOLID
+
 # Player-Konstanten
 PLAYER_HEIGHT = 1.8
 PLAYER_EYE_HEIGHT = 1.62
@@ -122,7 +124,8 @@ class Player:
         return overlap_x and overlap_y and overlap_z
 
     def is_block_solid(self, block_x, block_y, block_z, world_data, chunk_size):
-        if block_y < 0 or block_y >= 256: return True
+        # Unter der Welt ist alles solide, über der Welthöhe (Chunk-Shape) alles frei
+        if block_y < 0: return True
         cx = int(np.floor(block_x / chunk_size))
         cz = int(np.floor(block_z / chunk_size))
         bx = int(block_x - cx * chunk_size)
@@ -132,13 +135,9 @@ class Player:
         coord = (cx, cz)
         if coord in world_data:
             block_data = world_data[coord]
-            local_x_data = bx + 1
-            local_z_data = bz + 1
-            if 0 <= local_x_data < chunk_size + 2 and 0 <= by < block_data.shape[
-                1] and 0 <= local_z_data < chunk_size + 2:
-                b_id = block_data[local_x_data, by, local_z_data]
-                # Es ist solide, wenn es NICHT Luft (-1.0) UND NICHT Wasser (7.0) ist.
-                return b_id != -1.0 and b_id != 7.0
+            if 0 <= bx < chunk_size and 0 <= by < block_data.shape[1] and 0 <= bz < chunk_size:
+                b_id = block_data[bx, by, bz]
+                return bool(BLOCK_SOLID[b_id])
         return False
 
     def check_collisions(self, motion, world_data, chunk_size):
@@ -0,0 +1,142 @@
+# --- src/section_mesh.py ---
+import numpy as np
+
+from .geometry_constants import (
+    CUBE_NORMALS, FACE_AXES, VERTEX_WORDS,
+    PACKED_X_SHIFT, PACKED_Y_SHIFT, PACKED_Z_SHIFT, PACKED_FACE_SHIFT,
+    PACKED_XZ_MASK, PACKED_Y_MASK, PACKED_FACE_MASK
+)
+
+# Reserve im Vertex-Puffer jeder Section für In-Place-Patches (Anteil bzw. Minimum in Flächen)
+MESH_SLACK_RATIO = 0.25
+MESH_MIN_SLACK_FACES = 64
+
+# Index-Muster eines Quads, identisch in allen Meshern
+QUAD_INDEX_PATTERN = np.array([0, 1, 2, 2, 3, 0], dtype=np.uint32)
+
+
+def quad_indices(face_count):
+    """Indizes für face_count Quads à 4 Vertices (für den EBO über die volle Kapazität)."""
+    base = np.arange(face_count, dtype=np.uint32)[:, None] * 4
+    return (base + QUAD_INDEX_PATTERN).ravel()
+
+
+def capacity_for(face_count):
+    """Puffergröße in Flächen für face_count Flächen plus Reserve."""
+    return face_count + max(MESH_MIN_SLACK_FACES, int(face_count * MESH_SLACK_RATIO))
+
+
+def face_voxel_boxes(vertices):
+    """
+    Ordnet jede Fläche (4 gepackte Vertices) ihren Voxeln zu.
+    Rückgabe: (Face-Richtung, lo, hi) pro Fläche, überdeckt werden die Voxel
+    [lo, hi) (chunk-lokal). Einzelflächen decken genau einen Voxel ab,
+    Greedy-Quads ein Rechteck.
+    """
+    words = vertices[:, 0].reshape(-1, 4).astype(np.int64)
+    pos = np.stack([(words >> PACKED_X_SHIFT) & PACKED_XZ_MASK,
+                    (words >> PACKED_Y_SHIFT) & PACKED_Y_MASK,
+                    (words >> PACKED_Z_SHIFT) & PACKED_XZ_MASK], axis=-1)
+    faces = (words[:, 0] >> PACKED_FACE_SHIFT) & PACKED_FACE_MASK
+    lo = pos.min(axis=1)
+    hi = pos.max(axis=1)
+
+    # Die Fläche liegt auf einer Ebene; bei positiver Normale gehört sie zum Voxel darunter
+    rows = np.arange(faces.shape[0])
+    normal_axis = FACE_AXES[faces, 0]
+    lo[rows, normal_axis] -= CUBE_NORMALS[faces, normal_axis] > 0
+    hi[rows, normal_axis] = lo[rows, normal_axis] + 1
+    return faces, lo, hi
+
+
+def _slot_runs(slots):
+    """Sortierte Slot-Indizes -> zusammenhängende Bereiche [(start, stop), ...]."""
+    slots = np.unique(slots)
+    if slots.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(slots) != 1) + 1
+    starts = np.concatenate([slots[:1], slots[breaks]])
+    stops = np.concatenate([slots[breaks - 1], slots[-1:]]) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+class SectionMesh:
+    """
+    Mesh einer 16³-Section: CPU-Kopie der gepackten Vertices plus GPU-Puffer
+    mit Reserve (capacity_for).
+
+    Alle Mesher schreiben Quads mit demselben Index-Muster, eine Fläche kann
+    also in jedem Slot stehen. Beim Patchen landen neue Flächen in den Lücken
+    entfernter Flächen (oder hinten), übrige Lücken werden mit den letzten
+    Flächen gefüllt; hochgeladen werden nur die geänderten Slots.
+    vao, vbo, ebo setzt der ChunkManager (opengl_core.create_section_buffers).
+    """
+
+    __slots__ = ("vertices", "face_count", "vao", "vbo", "ebo")
+
+    def __init__(self, vertices):
+        self.vertices = np.zeros((0, VERTEX_WORDS), dtype=np.uint32)
+        self.face_count = 0
+        self.vao = self.vbo = self.ebo = None
+        self.set_faces(vertices)
+
+    @property
+    def capacity(self):
+        return self.vertices.shape[0] // 4
+
+    @property
+    def index_count(self):
+        return self.face_count * 6
+
+    def faces(self):
+        """Vertices der belegten Slots (Sicht, keine Kopie)."""
+        return self.vertices[:self.face_count * 4]
+
+    def set_faces(self, vertices):
+        """
+        Ersetzt alle Flächen (z.B. nach dem Neu-Meshen). Rückgabe: True, wenn sie
+        in den bestehenden Puffer passen (dann reicht ein Upload der ersten
+        face_count Slots), sonst wurde die CPU-Kopie neu angelegt.
+        """
+        face_count = vertices.shape[0] // 4
+        fits = face_count <= self.capacity <= 2 * capacity_for(face_count)
+        if not fits:
+            self.vertices = np.zeros((capacity_for(face_count) * 4, VERTEX_WORDS), dtype=np.uint32)
+        self.vertices[:face_count * 4] = vertices
+        self.face_count = face_count
+        return fits
+
+    def patch(self, removed, new_vertices):
+        """
+        Entfernt die Flächen in den Slots removed und fügt new_vertices hinzu.
+        Rückgabe: geänderte Slot-Bereiche [(start, stop), ...] für
+        glBufferSubData, oder None, wenn die Reserve nicht gereicht hat und die
+        CPU-Kopie neu angelegt wurde (dann komplett neu hochladen).
+        """
+        removed = np.unique(removed)
+        new_faces = new_vertices.reshape(-1, 4, VERTEX_WORDS)
+        count = self.face_count
+        final = count - removed.size + new_faces.shape[0]
+
+        if final > self.capacity:
+            keep = np.ones(count, dtype=np.bool_)
+            keep[removed] = False
+            kept = self.faces().reshape(-1, 4, VERTEX_WORDS)[keep]
+            self.set_faces(np.concatenate([kept, new_faces]).reshape(-1, VERTEX_WORDS))
+            return None
+
+        slots = self.vertices.reshape(-1, 4, VERTEX_WORDS)
+
+        # 1. Neue Flächen zuerst in die Lücken, der Rest hinten anhängen
+        fill = min(removed.size, new_faces.shape[0])
+        targets = np.concatenate([removed[:fill], np.arange(count, count + new_faces.shape[0] - fill)])
+        slots[targets] = new_faces
+
+        # 2. Übrige Lücken vor dem neuen Ende mit den letzten Flächen füllen
+        holes = removed[fill:]
+        moved_to = holes[holes < final]
+        moved_from = np.setdiff1d(np.arange(final, count), holes)
+        slots[moved_to] = slots[moved_from]
+
+        self.face_count = final
+        return _slot_runs(np.concatenate([targets, moved_to]))
@@ -0,0 +1,146 @@
+# --- src/terrain_noise.py ---
+import ctypes
+import numpy as np
+from numba import jit
+
+# Perlin-Permutation (Ken Perlin), identisch zu PERM aus noise/_noise.h
+_BASE_PERMUTATION = np.array([
+    151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7, 225, 140,
+    36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148, 247, 120,
+    234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32, 57, 177, 33,
+    88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175, 74, 165, 71,
+    134, 139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122, 60, 211, 133,
+    230, 220, 105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54, 65, 25, 63, 161,
+    1, 216, 80, 73, 209, 76, 132, 187, 208, 89, 18, 169, 200, 196, 135, 130,
+    116, 188, 159, 86, 164, 100, 109, 198, 173, 186, 3, 64, 52, 217, 226, 250,
+    124, 123, 5, 202, 38, 147, 118, 126, 255, 82, 85, 212, 207, 206, 59, 227,
+    47, 16, 58, 17, 182, 189, 28, 42, 223, 183, 170, 213, 119, 248, 152, 2, 44,
+    154, 163, 70, 221, 153, 101, 155, 167, 43, 172, 9, 129, 22, 39, 253, 19, 98,
+    108, 110, 79, 113, 224, 232, 178, 185, 112, 104, 218, 246, 97, 228, 251, 34,
+    242, 193, 238, 210, 144, 12, 191, 179, 162, 241, 81, 51, 145, 235, 249, 14,
+    239, 107, 49, 192, 214, 31, 181, 199, 106, 157, 184, 84, 204, 176, 115, 121,
+    50, 45, 127, 4, 150, 254, 138, 236, 205, 93, 222, 114, 67, 29, 24, 72, 243,
+    141, 128, 195, 78, 66, 215, 61, 156, 180
+], dtype=np.uint8)
+
+# Gradienten (x, y) aus GRAD3 in noise/_noise.h
+GRAD2_X = np.array([1, -1, 1, -1, 1, -1, 1, -1, 0, 0, 0, 0, 1, -1, 0, 0], dtype=np.float32)
+GRAD2_Y = np.array([1, 1, -1, -1, 0, 0, 0, 0, 1, -1, 1, -1, 0, 0, -1, 1], dtype=np.float32)
+
+# Größter Index, den noise2() mit base <= 999 anfassen kann: (255 + base) + 255
+PERM_TABLE_SIZE = 2048
+
+
+def _load_permutation_table():
+    """
+    Baut die (erweiterte) Permutationstabelle für die Kernel.
+
+    noise.pnoise2 rechnet PERM[(i & 255) + base] auf einer nur 512 Byte großen
+    Tabelle. Mit unseren Seeds (777, 888, 999) liest die C-Extension also hinter
+    das Tabellenende. Damit bestehende Welten gleich aussehen, lesen wir genau
+    diese Bytes aus der geladenen Extension. Ist sie nicht verfügbar, wird die
+    Permutation einfach wiederholt (deterministisch, aber andere Welt).
+    """
+    table = np.resize(_BASE_PERMUTATION, PERM_TABLE_SIZE)
+    try:
+        from noise import _perlin
+        lib = ctypes.CDLL(_perlin.__file__)
+        perm_symbol = ctypes.c_ubyte.in_dll(lib, "PERM")
+        raw = ctypes.string_at(ctypes.addressof(perm_symbol), PERM_TABLE_SIZE)
+        loaded = np.frombuffer(raw, dtype=np.uint8).copy()
+        if np.array_equal(loaded[:256], _BASE_PERMUTATION):
+            table = loaded
+    except (ImportError, OSError, ValueError, AttributeError):
+        pass
+    return table
+
+
+PERM_TABLE = _load_permutation_table()
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _grad2(hash_value, x, y):
+    h = hash_value & 15
+    return x * GRAD2_X[h] + y * GRAD2_Y[h]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _lerp(t, a, b):
+    return a + t * (b - a)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def perlin_noise2(x, y, repeatx, repeaty, base, perm):
+    """Eine Oktave 2D-Perlin-Noise, float32-genau wie noise2() in _perlin.c."""
+    one = np.float32(1.0)
+    i = int(np.floor(np.fmod(x, repeatx)))
+    j = int(np.floor(np.fmod(y, repeaty)))
+    ii = int(np.fmod(np.float32(i + 1), repeatx))
+    jj = int(np.fmod(np.float32(j + 1), repeaty))
+    i = (i & 255) + base
+    j = (j & 255) + base
+    ii = (ii & 255) + base
+    jj = (jj & 255) + base
+
+    x = x - np.floor(x)
+    y = y - np.floor(y)
+    fx = x * x * x * (x * (x * np.float32(6.0) - np.float32(15.0)) + np.float32(10.0))
+    fy = y * y * y * (y * (y * np.float32(6.0) - np.float32(15.0)) + np.float32(10.0))
+
+    a = int(perm[i])
+    aa = int(perm[a + j])
+    ab = int(perm[a + jj])
+    b = int(perm[ii])
+    ba = int(perm[b + j])
+    bb = int(perm[b + jj])
+
+    return _lerp(fy, _lerp(fx, _grad2(perm[aa], x, y),
+                           _grad2(perm[ba], x - one, y)),
+                 _lerp(fx, _grad2(perm[ab], x, y - one),
+                       _grad2(perm[bb], x - one, y - one)))
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fbm_noise2(x, y, octaves, persistence, lacunarity, repeatx, repeaty, base, perm):
+    """Fraktale Summe (fBm) über mehrere Oktaven, wie py_noise2 in _perlin.c."""
+    if octaves == 1:
+        return perlin_noise2(x, y, repeatx, repeaty, base, perm)
+
+    freq = np.float32(1.0)
+    amp = np.float32(1.0)
+    max_amp = np.float32(0.0)
+    total = np.float32(0.0)
+    for _ in range(octaves):
+        total += perlin_noise2(x * freq, y * freq, repeatx * freq, repeaty * freq, base, perm) * amp
+        max_amp += amp
+        freq *= lacunarity
+        amp *= persistence
+    return total / max_amp
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fbm_noise2_tile(xs, zs, scale, octaves, persistence, lacunarity, repeat, base, perm):
+    """
+    Berechnet eine ganze 2D-Kachel Noise in einem Aufruf ohne GIL.
+    xs/zs sind Weltkoordinaten (1D), Ergebnis hat Shape (len(xs), len(zs)).
+    """
+    out = np.empty((xs.shape[0], zs.shape[0]), dtype=np.float32)
+    persistence32 = np.float32(persistence)
+    lacunarity32 = np.float32(lacunarity)
+    repeat32 = np.float32(repeat)
+    for ix in range(xs.shape[0]):
+        # Wie beim Python-Aufruf: Produkt in double, danach auf float gecastet
+        sx = np.float32(xs[ix] * scale)
+        for iz in range(zs.shape[0]):
+            sz = np.float32(zs[iz] * scale)
+            out[ix, iz] = fbm_noise2(sx, sz, octaves, persistence32, lacunarity32,
+                                     repeat32, repeat32, base, perm)
+    return out
+
+
+def noise_tile(xs, zs, scale, octaves=1, base=0, repeat=1024.0, persistence=0.5, lacunarity=2.0):
+    """Komfort-Wrapper: Noise-Kachel mit denselben Defaults wie noise.pnoise2."""
+    xs = np.asarray(xs, dtype=np.float64)
+    zs = np.asarray(zs, dtype=np.float64)
+    return fbm_noise2_tile(xs, zs, float(scale), int(octaves), float(persistence),
+                           float(lacunarity), float(repeat), int(base), PERM_TABLE)
@@ -0,0 +1,104 @@
+# --- src/world_storage.py ---
+import os
+import re
+import json
+import threading
+
+import numpy as np
+
+from .chunk_data import CHUNK_SIZE, MAX_HEIGHT
+
+WORLD_META_FILE = "world.json"
+# Bei Änderungen am Chunk-Format (auch an der Licht-Berechnung) erhöhen; ältere Welten werden dann ignoriert
+CHUNK_FORMAT_VERSION = 4
+CHUNK_FILE_PATTERN = re.compile(r"^chunk_(-?\d+)_(-?\d+)\.npz$")
+# Meshes früherer pregen-Versionen (altes Vertex-Format, wurden nie gelesen)
+STALE_MESH_FILE_PATTERN = re.compile(r"^mesh_(-?\d+)_(-?\d+)\.npz$")
+
+
+class WorldStorage:
+    """
+    Speichert vorgenerierte Chunks auf der Platte (ein .npz pro Chunk).
+
+    Layout:
+        <world_dir>/world.json              Seed, Chunk-Format und Höhe der Welt
+        <world_dir>/chunk_<cx>_<cz>.npz     block_data (+ optional light_map)
+        <world_dir>/mesh_cache/             Section-Meshes (MeshCache, von pregen --mesh vorgewärmt)
+    """
+
+    def __init__(self, world_dir, world_seed):
+        self.world_dir = world_dir
+        self.world_seed = world_seed
+        self.enabled = True
+        self.outdated = False  # Altes Chunk-Format: darf von pregen überschrieben werden
+        self._lock = threading.Lock()
+        self._index = set()
+
+        meta_path = os.path.join(world_dir, WORLD_META_FILE)
+        if os.path.isfile(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            stored_seed = meta.get("seed")
+            if stored_seed != world_seed.value:
+                print(f"⚠️ WorldStorage: {world_dir} gehört zu Seed {stored_seed}, nicht {world_seed.value}. "
+                      f"Gespeicherte Chunks werden ignoriert.")
+                self.enabled = False
+                return
+            if meta.get("format") != CHUNK_FORMAT_VERSION or meta.get("height") != MAX_HEIGHT:
+                print(f"⚠️ WorldStorage: {world_dir} hat ein altes Chunk-Format oder eine andere Welthöhe. "
+                      f"Gespeicherte Chunks werden ignoriert (pregen.py neu ausführen).")
+                self.enabled = False
+                self.outdated = True
+                return
+
+        if os.path.isdir(world_dir):
+            for name in os.listdir(world_dir):
+                match = CHUNK_FILE_PATTERN.match(name)
+                if match:
+                    self._index.add((int(match.group(1)), int(match.group(2))))
+
+    def _chunk_path(self, cx, cz):
+        return os.path.join(self.world_dir, f"chunk_{cx}_{cz}.npz")
+
+    def has_chunk(self, cx, cz):
+        with self._lock:
+            return self.enabled and (cx, cz) in self._index
+
+    def write_meta(self):
+        os.makedirs(self.world_dir, exist_ok=True)
+        with open(os.path.join(self.world_dir, WORLD_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"seed": self.world_seed.value, "format": CHUNK_FORMAT_VERSION, "height": MAX_HEIGHT}, f)
+        self._remove_stale_meshes()
+
+    def _remove_stale_meshes(self):
+        for name in os.listdir(self.world_dir):
+            if STALE_MESH_FILE_PATTERN.match(name):
+                try:
+                    os.remove(os.path.join(self.world_dir, name))
+                except OSError:
+                    pass
+
+    def save_chunk(self, cx, cz, block_data, light_map=None):
+        os.makedirs(self.world_dir, exist_ok=True)
+        arrays = {"block_data": block_data}
+        if light_map is not None:
+            arrays["light_map"] = light_map
+        np.savez_compressed(self._chunk_path(cx, cz), **arrays)
+        with self._lock:
+            self._index.add((cx, cz))
+
+    def load_chunk(self, cx, cz):
+        """
+        Lädt (block_data, light_map); light_map ist None, wenn keine (passende)
+        gespeichert ist. Fehler werden wie bei den Worker-Wrappern als Exception zurückgegeben.
+        """
+        try:
+            with np.load(self._chunk_path(cx, cz)) as data:
+                block_data = data["block_data"]
+                light_map = data["light_map"] if "light_map" in data.files else None
+            if light_map is not None and light_map.shape != (CHUNK_SIZE, MAX_HEIGHT, CHUNK_SIZE, 2):
+                light_map = None
+            return block_data, light_map
+        except Exception as e:
+            return Exception(f"Fehler beim Laden von Chunk ({cx},{cz}): {e}")
+